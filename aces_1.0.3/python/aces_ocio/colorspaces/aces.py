@@ -9,10 +9,12 @@ from __future__ import division
 
 import copy
 import math
+import multiprocessing
 import numpy
 import os
 import pprint
 import shutil
+from multiprocessing.pool import ThreadPool
 
 import PyOpenColorIO as ocio
 
@@ -78,6 +80,42 @@ ACES_XYZ_TO_AP0 = [1.0498110175, 0.0000000000, -0.0000974845,
                    -0.4959030231, 1.3733130458, 0.0982400361,
                    0.0000000000, 0.0000000000, 0.9912520182]
 
+# 4x4 form of :attr:`ACES_AP1_TO_AP0` used by the colorspace matrix transforms.
+_ACES_AP1_TO_AP0_MAT44 = mat44_from_mat33(ACES_AP1_TO_AP0)
+
+# Paths of the LUTs written by :func:`create_ADX`.
+_WRITTEN_LUTS = set()
+
+
+def _map_concurrently(function, arguments):
+    """
+    Calls given function with each of the given argument tuples, using a pool
+    of threads. The function is expected to spend most of its time waiting on
+    external processes such as *ctlrender*.
+
+    Parameters
+    ----------
+    function : callable
+        The function to call.
+    arguments : list of tuple
+        The positional arguments of each call.
+
+    Returns
+    -------
+    list
+         The values returned by each call, in the order of the arguments.
+    """
+
+    if len(arguments) < 2:
+        return [function(*argument) for argument in arguments]
+
+    pool = ThreadPool(min(len(arguments), multiprocessing.cpu_count()))
+    try:
+        return pool.map(lambda argument: function(*argument), arguments)
+    finally:
+        pool.close()
+        pool.join()
+
 
 def create_ACES():
     """
@@ -188,7 +226,7 @@ def create_ACEScc(aces_ctl_directory,
     # *AP1* primaries to *AP0* primaries
     cs.to_reference_transforms.append({
         'type': 'matrix',
-        'matrix': mat44_from_mat33(ACES_AP1_TO_AP0),
+        'matrix': _ACES_AP1_TO_AP0_MAT44,
         'direction': 'forward'})
 
     cs.from_reference_transforms = []
@@ -291,7 +329,7 @@ def create_ACEScct(aces_ctl_directory,
     # *AP1* primaries to *AP0* primaries
     cs.to_reference_transforms.append({
         'type': 'matrix',
-        'matrix': mat44_from_mat33(ACES_AP1_TO_AP0),
+        'matrix': _ACES_AP1_TO_AP0_MAT44,
         'direction': 'forward'})
 
     cs.from_reference_transforms = []
@@ -373,7 +411,7 @@ def create_ACESproxy(aces_ctl_directory,
     # *AP1* primaries to *AP0* primaries
     cs.to_reference_transforms.append({
         'type': 'matrix',
-        'matrix': mat44_from_mat33(ACES_AP1_TO_AP0),
+        'matrix': _ACES_AP1_TO_AP0_MAT44,
         'direction': 'forward'})
 
     cs.from_reference_transforms = []
@@ -411,7 +449,7 @@ def create_ACEScg():
     # *AP1* primaries to *AP0* primaries
     cs.to_reference_transforms.append({
         'type': 'matrix',
-        'matrix': mat44_from_mat33(ACES_AP1_TO_AP0),
+        'matrix': _ACES_AP1_TO_AP0_MAT44,
         'direction': 'forward'})
 
     cs.from_reference_transforms = []
@@ -533,9 +571,9 @@ def create_ADX(lut_directory,
                   math.log(0.18, 10))
 
         def cid_to_rle(x):
-            if x <= 0.6:
-                return interpolate_1d(x, LUT_1D_XP, LUT_1D_FP)
-            return (100 / 55) * x - REF_PT
+            return numpy.where(x <= 0.6,
+                               interpolate_1d(x, LUT_1D_XP, LUT_1D_FP),
+                               (100 / 55) * x - REF_PT)
 
         def fit(value, from_min, from_max, to_min, to_max):
             if from_min == from_max:
@@ -543,21 +581,27 @@ def create_ADX(lut_directory,
             return (value - from_min) / (from_max - from_min) * (
                 to_max - to_min) + to_min
 
+        lut = 'ADX_CID_to_RLE.spi1d'
+        lut_path = os.path.join(lut_directory, lut)
+
+        # The LUT is shared by the 10 and 16 bit *ADX* colorspaces.
+        if lut_path in _WRITTEN_LUTS and os.path.isfile(lut_path):
+            return lut
+
         num_samples = 2 ** 12
         domain = (-0.19, 3)
-        data = []
-        for i in xrange(num_samples):
-            x = i / (num_samples - 1)
-            x = fit(x, 0, 1, domain[0], domain[1])
-            data.append(cid_to_rle(x))
+        x = numpy.arange(num_samples) / (num_samples - 1)
+        x = fit(x, 0, 1, domain[0], domain[1])
+        data = cid_to_rle(x)
 
-        lut = 'ADX_CID_to_RLE.spi1d'
-        write_SPI_1d(os.path.join(lut_directory, lut),
+        write_SPI_1d(lut_path,
                      domain[0],
                      domain[1],
                      data,
                      num_samples, 1)
 
+        _WRITTEN_LUTS.add(lut_path)
+
         return lut
 
     # Converting *Channel Independent Density* values to
@@ -1082,10 +1126,11 @@ def create_LMTs(aces_ctl_directory,
 
     sorted_lmts = sorted(lmt_info.iteritems(), key=lambda x: x[1])
     print(sorted_lmts)
+    lmt_arguments = []
     for lmt in sorted_lmts:
         lmt_name, lmt_values = lmt
         lmt_aliases = ['look_%s' % compact(lmt_values['transformUserName'])]
-        cs = create_ACES_LMT(
+        lmt_arguments.append((
             lmt_values['transformUserName'],
             lmt_values,
             lmt_shaper_data,
@@ -1093,8 +1138,10 @@ def create_LMTs(aces_ctl_directory,
             lut_directory,
             lmt_lut_resolution_3d,
             cleanup,
-            lmt_aliases)
-        colorspaces.append(cs)
+            lmt_aliases))
+
+    # The *LMTs* are independent, their 3D LUTs are generated concurrently.
+    colorspaces.extend(_map_concurrently(create_ACES_LMT, lmt_arguments))
 
     return colorspaces
 
@@ -1162,6 +1209,8 @@ def create_ACES_RRT_plus_ODT(odt_name,
      shaper_input_scale,
      shaper_params) = shaper_info
 
+    # The shaper parameters are shared between the *Output Transforms*.
+    shaper_params = shaper_params.copy()
     if 'legalRange' in odt_values:
         shaper_params['legalRange'] = odt_values['legalRange']
     else:
@@ -1372,7 +1421,7 @@ def create_shapers_log2(aces_ctl_directory,
     # *AP1* primaries to *AP0* primaries
     log2_shaper_api1_colorspace.to_reference_transforms.append({
         'type': 'matrix',
-        'matrix': mat44_from_mat33(ACES_AP1_TO_AP0),
+        'matrix': _ACES_AP1_TO_AP0_MAT44,
         'direction': 'forward'})
     colorspaces.append(log2_shaper_api1_colorspace)
 
@@ -1476,7 +1525,7 @@ def create_shapers_dolbypq(aces_ctl_directory,
     # *AP1* primaries to *AP0* primaries
     dolby_pq_shaper_api1_colorspace.to_reference_transforms.append({
         'type': 'matrix',
-        'matrix': mat44_from_mat33(ACES_AP1_TO_AP0),
+        'matrix': _ACES_AP1_TO_AP0_MAT44,
         'direction': 'forward'})
     colorspaces.append(dolby_pq_shaper_api1_colorspace)
 
@@ -1745,6 +1794,7 @@ def create_ODTs(aces_ctl_directory,
     # *RRT + ODT* combinations.
     sorted_odts = sorted(odt_info.iteritems(), key=lambda x: x[1])
     print(sorted_odts)
+    odt_arguments = []
     for odt in sorted_odts:
         (odt_name, odt_values) = odt
 
@@ -1764,7 +1814,7 @@ def create_ODTs(aces_ctl_directory,
         else:
             rrt_shaper = rrt_shaper_48nits
 
-        cs = create_ACES_RRT_plus_ODT(
+        odt_arguments.append((
             odt_name_legal,
             odt_legal,
             rrt_shaper,
@@ -1772,10 +1822,16 @@ def create_ODTs(aces_ctl_directory,
             lut_directory,
             lut_resolution_3d,
             cleanup,
-            odt_aliases)
+            odt_aliases))
+
+    # The *RRT + ODT* combinations are independent, their 3D LUTs are
+    # generated concurrently.
+    for arguments, cs in zip(
+            odt_arguments,
+            _map_concurrently(create_ACES_RRT_plus_ODT, odt_arguments)):
         colorspaces.append(cs)
 
-        displays[odt_name_legal] = {
+        displays[arguments[0]] = {
             'Raw': linear_display_space,
             'Log': log_display_space,
             'Output Transform': cs}
@@ -2048,19 +2104,18 @@ def create_colorspaces(aces_ctl_directory,
 
     ACES = create_ACES()
 
-    ACEScc = create_ACEScc(aces_ctl_directory, lut_directory,
-                           lut_resolution_1d, cleanup,
-                           min_value=-0.35840, max_value=1.468)
-    colorspaces.append(ACEScc)
-
-    ACEScct = create_ACEScct(aces_ctl_directory, lut_directory,
-                             lut_resolution_1d, cleanup,
-                             min_value=-0.24913611, max_value=1.468)
-    colorspaces.append(ACEScct)
-
-    ACESproxy = create_ACESproxy(aces_ctl_directory, lut_directory,
-                                 lut_resolution_1d, cleanup)
-    colorspaces.append(ACESproxy)
+    # The *ACEScc*, *ACEScct* and *ACESproxy* 1D LUTs are independent, they are
+    # generated concurrently.
+    ACEScc, ACEScct, ACESproxy = _map_concurrently(
+        lambda create, keywords: create(aces_ctl_directory,
+                                        lut_directory,
+                                        lut_resolution_1d,
+                                        cleanup,
+                                        **keywords),
+        [(create_ACEScc, {'min_value': -0.35840, 'max_value': 1.468}),
+         (create_ACEScct, {'min_value': -0.24913611, 'max_value': 1.468}),
+         (create_ACESproxy, {})])
+    colorspaces.extend([ACEScc, ACEScct, ACESproxy])
 
     ACEScg = create_ACEScg()
     colorspaces.append(ACEScg)
@@ -7,8 +7,8 @@ Implements support for *ARRI* colorspaces conversions and transfer functions.
 
 from __future__ import division
 
-import array
 import math
+import numpy
 import os
 
 import PyOpenColorIO as ocio
@@ -26,6 +26,17 @@ __status__ = 'Production'
 __all__ = ['create_log_c',
            'create_colorspaces']
 
+# Transfer function, exposure index, resolution and path of the LUTs written
+# by :func:`create_log_c`.
+_WRITTEN_LUTS = set()
+
+# Matrices converting the *ARRI* camera gamuts to *ACES AP0*.
+_GAMUT_MATRICES = {
+    'Wide Gamut': mat44_from_mat33([
+        0.680206, 0.236137, 0.083658,
+        0.085415, 1.017471, -0.102886,
+        0.002057, -0.062563, 1.060506])}
+
 
 def create_log_c(gamut,
                  transfer_function,
@@ -105,6 +116,8 @@ def create_log_c(gamut,
         return (ns - black_signal) * (0.18 / (mid_gray_signal * nominal_exposure_index / ei))
 
     def normalized_log_c_to_linear(code_value, exposure_index):
+        # The curve parameters only depend on the exposure index, they are
+        # computed once for the whole array of code values.
         cut = 1 / 9
         slope = 1 / (cut * math.log(10))
         offset = math.log10(cut) - slope * cut
@@ -119,39 +132,46 @@ def create_log_c(gamut,
         # see if we need to bring the hermite spline into play
         xm = math.log10((1 - black_signal) / gray + nz) * enc_gain + enc_offset
         if xm > 1.0:
-            if code_value > 0.8:
-                hw = hermite_weights(code_value, 0.8, 1)
-                d = 0.2 / (xm - 0.8)
-                v = [ 0.8, xm, 1.0, 1 / (d * d) ]
-                # reconstruct code value from spline
-                code_value = 0
-                for i in range(0, 4):
-                    code_value += (hw[i] * v[i])
+            hw = hermite_weights(code_value, 0.8, 1)
+            d = 0.2 / (xm - 0.8)
+            v = [ 0.8, xm, 1.0, 1 / (d * d) ]
+            # reconstruct code value from spline
+            spline_code_value = 0
+            for i in range(0, 4):
+                spline_code_value += (hw[i] * v[i])
+            code_value = numpy.where(code_value > 0.8, spline_code_value, code_value)
         code_value = (code_value - enc_offset) / enc_gain
         # compute normalized sensor value
-        ns = pow(10, code_value) if (code_value - offset) / slope > cut else (code_value - offset) / slope
+        ns = numpy.where((code_value - offset) / slope > cut, numpy.power(10, code_value), (code_value - offset) / slope)
         ns = (ns - nz) * gray + black_signal
         return normalized_sensor_to_relative_exposure(ns, exposure_index)
 
     cs.to_reference_transforms = []
 
     if transfer_function == 'V3 LogC':
-        data = array.array('f', '\0' * lut_resolution_1d * 4)
-        for c in range(lut_resolution_1d):
-            data[c] = normalized_log_c_to_linear(c / (lut_resolution_1d - 1), int(exposure_index))
-
         lut = '%s_to_linear.spi1d' % (
             '%s_%s' % (transfer_function, exposure_index))
 
         lut = sanitize(lut)
-
-        genlut.write_SPI_1d(
-            os.path.join(lut_directory, lut),
-            0,
-            1,
-            data,
-            lut_resolution_1d,
-            1)
+        lut_path = os.path.join(lut_directory, lut)
+
+        # The LUT is shared by the curve and full conversion colorspaces of
+        # the exposure index.
+        lut_key = (transfer_function, exposure_index, lut_resolution_1d,
+                   lut_path)
+        if lut_key not in _WRITTEN_LUTS or not os.path.isfile(lut_path):
+            data = normalized_log_c_to_linear(numpy.arange(lut_resolution_1d) / (lut_resolution_1d - 1), int(exposure_index))
+            data = data.astype(numpy.float32)
+
+            genlut.write_SPI_1d(
+                lut_path,
+                0,
+                1,
+                data,
+                lut_resolution_1d,
+                1)
+
+            _WRITTEN_LUTS.add(lut_key)
 
         cs.to_reference_transforms.append({
             'type': 'lutFile',
@@ -159,12 +179,11 @@ def create_log_c(gamut,
             'interpolation': 'linear',
             'direction': 'forward'})
 
-    if gamut == 'Wide Gamut':
+    matrix = _GAMUT_MATRICES.get(gamut)
+    if matrix is not None:
         cs.to_reference_transforms.append({
             'type': 'matrix',
-            'matrix': mat44_from_mat33([0.680206, 0.236137, 0.083658,
-                                        0.085415, 1.017471, -0.102886,
-                                        0.002057, -0.062563, 1.060506]),
+            'matrix': matrix,
             'direction': 'forward'})
 
     cs.from_reference_transforms = []
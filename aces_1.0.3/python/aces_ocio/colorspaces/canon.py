@@ -7,7 +7,7 @@ Implements support for *Canon* colorspaces conversions and transfer functions.
 
 from __future__ import division
 
-import array
+import numpy
 import os
 
 import PyOpenColorIO as ocio
@@ -25,6 +25,53 @@ __status__ = 'Production'
 __all__ = ['create_c_log',
            'create_colorspaces']
 
+# Transfer function, resolution and path of the LUTs written by
+# :func:`create_c_log`.
+_WRITTEN_LUTS = set()
+
+# Matrices converting the *Canon* camera gamuts to *ACES AP0*.
+_GAMUT_MATRICES = {
+    'Rec. 709 Daylight': (
+        0.561538969, 0.402060105, 0.036400926, 0,
+        0.092739623, 0.924121198, -0.016860821, 0,
+        0.084812961, 0.006373835, 0.908813204, 0,
+        0, 0, 0, 1),
+    'Rec. 709 Tungsten': (
+        0.566996399, 0.365079418, 0.067924183, 0,
+        0.070901044, 0.880331008, 0.048767948, 0,
+        0.073013542, -0.066540862, 0.99352732, 0,
+        0, 0, 0, 1),
+    'DCI-P3 Daylight': (
+        0.607160575, 0.299507286, 0.093332140, 0,
+        0.004968120, 1.050982224, -0.055950343, 0,
+        -0.007839939, 0.000809127, 1.007030813, 0,
+        0, 0, 0, 1),
+    'DCI-P3 Tungsten': (
+        0.650279125, 0.253880169, 0.095840706, 0,
+        -0.026137986, 1.017900530, 0.008237456, 0,
+        0.007757558, -0.063081669, 1.055324110, 0,
+        0, 0, 0, 1),
+    'Cinema Gamut Daylight': (
+        0.763064455, 0.149021161, 0.087914384, 0,
+        0.003657457, 1.10696038, -0.110617837, 0,
+        -0.009407794, -0.218383305, 1.227791099, 0,
+        0, 0, 0, 1),
+    'Cinema Gamut Tungsten': (
+        0.817416293, 0.090755698, 0.091828009, 0,
+        -0.035361374, 1.065690585, -0.030329211, 0,
+        0.010390366, -0.299271107, 1.288880741, 0,
+        0, 0, 0, 1),
+    'Rec. 2020 Daylight': (
+        0.678891151, 0.158868422, 0.162240427, 0,
+        0.045570831, 0.860712772, 0.093716397, 0,
+        -0.000485710, 0.025060196, 0.975425515, 0,
+        0, 0, 0, 1),
+    'Rec. 2020 Tungsten': (
+        0.724488568, 0.115140904, 0.160370529, 0,
+        0.010659276, 0.839605344, 0.149735380, 0,
+        0.014560161, -0.028562057, 1.014001897, 0,
+        0, 0, 0, 1)}
+
 
 def create_c_log(gamut,
                  transfer_function,
@@ -83,7 +130,8 @@ def create_c_log(gamut,
         c2 = 10.1596
         c3 = 0.0730597
 
-        linear = (pow(10, (legal_to_full(code_value) - c3) / c1) - 1) / c2
+        linear = (numpy.power(10, (legal_to_full(code_value) - c3) / c1) -
+                  1) / c2
         linear *= 0.9
 
         return linear
@@ -95,7 +143,8 @@ def create_c_log(gamut,
         c2 = 87.09937546
         c3 = 0.035388128
 
-        linear = (pow(10, (legal_to_full(code_value) - c3) / c1) - 1) / c2
+        linear = (numpy.power(10, (legal_to_full(code_value) - c3) / c1) -
+                  1) / c2
         linear *= 0.9
 
         return linear
@@ -123,12 +172,11 @@ def create_c_log(gamut,
 
         clog3_ire = legal_to_full(code_value)
 
-        if clog3_ire < c4:
-            linear = -(pow(10, (c5 - clog3_ire) / c1) - 1) / c2
-        elif clog3_ire <= c6:
-            linear = (clog3_ire - c7) / c8
-        else:
-            linear = (pow(10, (clog3_ire - c3) / c1) - 1) / c2
+        linear = numpy.select(
+            [clog3_ire < c4, clog3_ire <= c6],
+            [-(numpy.power(10, (c5 - clog3_ire) / c1) - 1) / c2,
+             (clog3_ire - c7) / c8],
+            (numpy.power(10, (clog3_ire - c3) / c1) - 1) / c2)
         linear *= 0.9
 
         return linear
@@ -136,27 +184,31 @@ def create_c_log(gamut,
     cs.to_reference_transforms = []
 
     if transfer_function:
-        if transfer_function == 'Canon-Log':
-            data = array.array('f', '\0' * lut_resolution_1d * 4)
-            for c in range(lut_resolution_1d):
-                data[c] = c_log_to_linear(1023 * c / (lut_resolution_1d - 1))
-        elif transfer_function == 'Canon-Log2':
-            data = array.array('f', '\0' * lut_resolution_1d * 4)
-            for c in range(lut_resolution_1d):
-                data[c] = c_log2_to_linear(1023 * c / (lut_resolution_1d - 1))
-        elif transfer_function == 'Canon-Log3':
-            data = array.array('f', '\0' * lut_resolution_1d * 4)
-            for c in range(lut_resolution_1d):
-                data[c] = c_log3_to_linear(1023 * c / (lut_resolution_1d - 1))
-
         lut = '%s_to_linear.spi1d' % transfer_function
-        genlut.write_SPI_1d(
-            os.path.join(lut_directory, lut),
-            0,
-            1,
-            data,
-            lut_resolution_1d,
-            1)
+        lut_path = os.path.join(lut_directory, lut)
+
+        # The LUT is shared by all the gamuts using the transfer function.
+        lut_key = (transfer_function, lut_resolution_1d, lut_path)
+        if lut_key not in _WRITTEN_LUTS or not os.path.isfile(lut_path):
+            code_values = (1023 * numpy.arange(lut_resolution_1d) /
+                           (lut_resolution_1d - 1))
+            if transfer_function == 'Canon-Log':
+                data = c_log_to_linear(code_values)
+            elif transfer_function == 'Canon-Log2':
+                data = c_log2_to_linear(code_values)
+            elif transfer_function == 'Canon-Log3':
+                data = c_log3_to_linear(code_values)
+            data = data.astype(numpy.float32)
+
+            genlut.write_SPI_1d(
+                lut_path,
+                0,
+                1,
+                data,
+                lut_resolution_1d,
+                1)
+
+            _WRITTEN_LUTS.add(lut_key)
 
         cs.to_reference_transforms.append({
             'type': 'lutFile',
@@ -164,69 +216,11 @@ def create_c_log(gamut,
             'interpolation': 'linear',
             'direction': 'forward'})
 
-    if gamut == 'Rec. 709 Daylight':
-        cs.to_reference_transforms.append({
-            'type': 'matrix',
-            'matrix': [0.561538969, 0.402060105, 0.036400926, 0,
-                       0.092739623, 0.924121198, -0.016860821, 0,
-                       0.084812961, 0.006373835, 0.908813204, 0,
-                       0, 0, 0, 1],
-            'direction': 'forward'})
-    elif gamut == 'Rec. 709 Tungsten':
-        cs.to_reference_transforms.append({
-            'type': 'matrix',
-            'matrix': [0.566996399, 0.365079418, 0.067924183, 0,
-                       0.070901044, 0.880331008, 0.048767948, 0,
-                       0.073013542, -0.066540862, 0.99352732, 0,
-                       0, 0, 0, 1],
-            'direction': 'forward'})
-    elif gamut == 'DCI-P3 Daylight':
-        cs.to_reference_transforms.append({
-            'type': 'matrix',
-            'matrix': [0.607160575, 0.299507286, 0.093332140, 0,
-                       0.004968120, 1.050982224, -0.055950343, 0,
-                       -0.007839939, 0.000809127, 1.007030813, 0,
-                       0, 0, 0, 1],
-            'direction': 'forward'})
-    elif gamut == 'DCI-P3 Tungsten':
-        cs.to_reference_transforms.append({
-            'type': 'matrix',
-            'matrix': [0.650279125, 0.253880169, 0.095840706, 0,
-                       -0.026137986, 1.017900530, 0.008237456, 0,
-                       0.007757558, -0.063081669, 1.055324110, 0,
-                       0, 0, 0, 1],
-            'direction': 'forward'})
-    elif gamut == 'Cinema Gamut Daylight':
-        cs.to_reference_transforms.append({
-            'type': 'matrix',
-            'matrix': [0.763064455, 0.149021161, 0.087914384, 0,
-                       0.003657457, 1.10696038, -0.110617837, 0,
-                       -0.009407794, -0.218383305, 1.227791099, 0,
-                       0, 0, 0, 1],
-            'direction': 'forward'})
-    elif gamut == 'Cinema Gamut Tungsten':
-        cs.to_reference_transforms.append({
-            'type': 'matrix',
-            'matrix': [0.817416293, 0.090755698, 0.091828009, 0,
-                       -0.035361374, 1.065690585, -0.030329211, 0,
-                       0.010390366, -0.299271107, 1.288880741, 0,
-                       0, 0, 0, 1],
-            'direction': 'forward'})
-    elif gamut == 'Rec. 2020 Daylight':
-        cs.to_reference_transforms.append({
-            'type': 'matrix',
-            'matrix': [0.678891151, 0.158868422, 0.162240427, 0,
-                       0.045570831, 0.860712772, 0.093716397, 0,
-                       -0.000485710, 0.025060196, 0.975425515, 0,
-                       0, 0, 0, 1],
-            'direction': 'forward'})
-    elif gamut == 'Rec. 2020 Tungsten':
+    matrix = _GAMUT_MATRICES.get(gamut)
+    if matrix is not None:
         cs.to_reference_transforms.append({
             'type': 'matrix',
-            'matrix': [0.724488568, 0.115140904, 0.160370529, 0,
-                       0.010659276, 0.839605344, 0.149735380, 0,
-                       0.014560161, -0.028562057, 1.014001897, 0,
-                       0, 0, 0, 1],
+            'matrix': matrix,
             'direction': 'forward'})
 
     cs.from_reference_transforms = []
@@ -7,8 +7,8 @@ Implements support for general colorspaces conversions and transfer functions.
 
 from __future__ import division
 
-import array
 import copy
+import numpy
 import os
 
 import PyOpenColorIO as ocio
@@ -152,9 +152,11 @@ def create_transfer_colorspace(name='transfer',
     cs.allocation_vars = [0, 1]
 
     # Sampling the transfer function.
-    data = array.array('f', '\0' * lut_resolution_1d * 4)
-    for c in range(lut_resolution_1d):
-        data[c] = transfer_function(c / (lut_resolution_1d - 1))
+    data = numpy.fromiter(
+        (transfer_function(c / (lut_resolution_1d - 1))
+         for c in range(lut_resolution_1d)),
+        dtype=numpy.float32,
+        count=lut_resolution_1d)
 
     # Writing the sampled data to a *LUT*.
     lut = '%s_to_linear.spi1d' % transfer_function_name
@@ -245,9 +247,11 @@ def create_matrix_plus_transfer_colorspace(
     cs.allocation_vars = [0, 1]
 
     # Sampling the transfer function.
-    data = array.array('f', '\0' * lut_resolution_1d * 4)
-    for c in range(lut_resolution_1d):
-        data[c] = transfer_function(c / (lut_resolution_1d - 1))
+    data = numpy.fromiter(
+        (transfer_function(c / (lut_resolution_1d - 1))
+         for c in range(lut_resolution_1d)),
+        dtype=numpy.float32,
+        count=lut_resolution_1d)
 
     # Writing the sampled data to a *LUT*.
     lut = '%s_to_linear.spi1d' % transfer_function_name
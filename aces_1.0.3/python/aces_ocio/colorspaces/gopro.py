@@ -7,7 +7,7 @@ Implements support for *GoPro* colorspaces conversions and transfer functions.
 
 from __future__ import division
 
-import array
+import numpy
 import os
 
 import PyOpenColorIO as ocio
@@ -79,16 +79,16 @@ def create_protune(gamut,
         c1 = 113.0
         c2 = 1.0
         c3 = 112.0
-        linear = ((pow(c1, normalized_code_value) - c2) / c3)
+        linear = ((numpy.power(c1, normalized_code_value) - c2) / c3)
 
         return linear
 
     cs.to_reference_transforms = []
 
     if transfer_function == 'Protune Flat':
-        data = array.array('f', '\0' * lut_resolution_1d * 4)
-        for c in range(lut_resolution_1d):
-            data[c] = protune_to_linear(float(c) / (lut_resolution_1d - 1))
+        data = protune_to_linear(
+            numpy.arange(lut_resolution_1d) / (lut_resolution_1d - 1))
+        data = data.astype(numpy.float32)
 
         lut = '%s_to_linear.spi1d' % transfer_function
         lut = sanitize(lut)
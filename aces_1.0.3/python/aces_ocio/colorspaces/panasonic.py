@@ -6,7 +6,7 @@ Implements support for *Panasonic* colorspaces conversions and transfer
 functions.
 """
 
-import array
+import numpy
 import os
 
 import PyOpenColorIO as ocio
@@ -78,17 +78,16 @@ def create_v_log(gamut,
         c = 0.241514
         d = 0.598206
 
-        if x <= cut_inv:
-            return (x - 0.125) / 5.6
-        else:
-            return pow(10, (x - d) / c) - b
+        return numpy.where(x <= cut_inv,
+                           (x - 0.125) / 5.6,
+                           numpy.power(10, (x - d) / c) - b)
 
     cs.to_reference_transforms = []
 
     if transfer_function == 'V-Log':
-        data = array.array('f', '\0' * lut_resolution_1d * 4)
-        for c in range(lut_resolution_1d):
-            data[c] = v_log_to_linear(float(c) / (lut_resolution_1d - 1))
+        data = v_log_to_linear(
+            numpy.arange(lut_resolution_1d) / (lut_resolution_1d - 1))
+        data = data.astype(numpy.float32)
 
         lut = '%s_to_linear.spi1d' % transfer_function
         genlut.write_SPI_1d(
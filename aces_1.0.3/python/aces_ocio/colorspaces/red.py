@@ -7,7 +7,7 @@ Implements support for *RED* colorspaces conversions and transfer functions.
 
 from __future__ import division
 
-import array
+import numpy
 import os
 
 import PyOpenColorIO as ocio
@@ -25,6 +25,41 @@ __status__ = 'Production'
 __all__ = ['create_red_log_film',
            'create_colorspaces']
 
+# Transfer function, resolution and path of the LUTs written by
+# :func:`create_red_log_film`.
+_WRITTEN_LUTS = set()
+
+# Matrices converting the *RED* camera gamuts to *ACES AP0*.
+_GAMUT_MATRICES = {
+    'DRAGONcolor': mat44_from_mat33([
+        0.532279, 0.376648, 0.091073,
+        0.046344, 0.974513, -0.020860,
+        -0.053976, -0.000320, 1.054267]),
+    'DRAGONcolor2': mat44_from_mat33([
+        0.468452, 0.331484, 0.200064,
+        0.040787, 0.857658, 0.101553,
+        -0.047504, -0.000282, 1.047756]),
+    'REDcolor': mat44_from_mat33([
+        0.451464, 0.388498, 0.160038,
+        0.062716, 0.866790, 0.070491,
+        -0.017541, 0.086921, 0.930590]),
+    'REDcolor2': mat44_from_mat33([
+        0.480997, 0.402289, 0.116714,
+        -0.004938, 1.000154, 0.004781,
+        -0.105257, 0.025320, 1.079907]),
+    'REDcolor3': mat44_from_mat33([
+        0.512136, 0.360370, 0.127494,
+        0.070377, 0.903884, 0.025737,
+        -0.020824, 0.017671, 1.003123]),
+    'REDcolor4': mat44_from_mat33([
+        0.474202, 0.333677, 0.192121,
+        0.065164, 0.836932, 0.097901,
+        -0.019281, 0.016362, 1.002889]),
+    'REDWideGamutRGB': mat44_from_mat33([
+        0.785043, 0.083844, 0.131118,
+        0.023172, 1.087892, -0.111055,
+        -0.073769, -0.314639, 1.388537])}
+
 
 def create_red_log_film(gamut,
                         transfer_function,
@@ -84,7 +119,7 @@ def create_red_log_film(gamut,
 
         black_linear = pow(10, (black_point - white_point) * (
             code_value_to_density / n_gamma))
-        code_linear = pow(10, (code_value - white_point) * (
+        code_linear = numpy.power(10, (code_value - white_point) * (
             code_value_to_density / n_gamma))
 
         return (code_linear - black_linear) / (1 - black_linear)
@@ -96,12 +131,10 @@ def create_red_log_film(gamut,
 
         normalized_log = code_value / 1023.0
 
-        mirror = 1.0
-        if normalized_log < 0.0:
-            mirror = -1.0
-            normalized_log = -normalized_log
+        mirror = numpy.where(normalized_log < 0.0, -1.0, 1.0)
+        normalized_log = numpy.abs(normalized_log)
 
-        linear = (pow(10.0, normalized_log / a) - 1) / b
+        linear = (numpy.power(10.0, normalized_log / a) - 1) / b
         linear = linear * mirror - c
 
         return linear
@@ -111,23 +144,32 @@ def create_red_log_film(gamut,
     if transfer_function:
         if transfer_function == 'REDlogFilm':
             lut_name = "CineonLog"
-            data = array.array('f', '\0' * lut_resolution_1d * 4)
-            for c in range(lut_resolution_1d):
-                data[c] = cineon_to_linear(1023 * c / (lut_resolution_1d - 1))
         elif transfer_function == 'REDLog3G10':
             lut_name = "REDLog3G10"
-            data = array.array('f', '\0' * lut_resolution_1d * 4)
-            for c in range(lut_resolution_1d):
-                data[c] = log3g10_to_linear(1023 * c / (lut_resolution_1d - 1))
 
         lut = '%s_to_linear.spi1d' % lut_name
-        genlut.write_SPI_1d(
-            os.path.join(lut_directory, lut),
-            0,
-            1,
-            data,
-            lut_resolution_1d,
-            1)
+        lut_path = os.path.join(lut_directory, lut)
+
+        # The LUT is shared by all the gamuts using the transfer function.
+        lut_key = (lut_name, lut_resolution_1d, lut_path)
+        if lut_key not in _WRITTEN_LUTS or not os.path.isfile(lut_path):
+            code_values = (1023 * numpy.arange(lut_resolution_1d) /
+                           (lut_resolution_1d - 1))
+            if transfer_function == 'REDlogFilm':
+                data = cineon_to_linear(code_values)
+            elif transfer_function == 'REDLog3G10':
+                data = log3g10_to_linear(code_values)
+            data = data.astype(numpy.float32)
+
+            genlut.write_SPI_1d(
+                lut_path,
+                0,
+                1,
+                data,
+                lut_resolution_1d,
+                1)
+
+            _WRITTEN_LUTS.add(lut_key)
 
         cs.to_reference_transforms.append({
             'type': 'lutFile',
@@ -135,54 +177,11 @@ def create_red_log_film(gamut,
             'interpolation': 'linear',
             'direction': 'forward'})
 
-    if gamut == 'DRAGONcolor':
-        cs.to_reference_transforms.append({
-            'type': 'matrix',
-            'matrix': mat44_from_mat33([0.532279, 0.376648, 0.091073,
-                                        0.046344, 0.974513, -0.020860,
-                                        -0.053976, -0.000320, 1.054267]),
-            'direction': 'forward'})
-    elif gamut == 'DRAGONcolor2':
-        cs.to_reference_transforms.append({
-            'type': 'matrix',
-            'matrix': mat44_from_mat33([0.468452, 0.331484, 0.200064,
-                                        0.040787, 0.857658, 0.101553,
-                                        -0.047504, -0.000282, 1.047756]),
-            'direction': 'forward'})
-    elif gamut == 'REDcolor':
-        cs.to_reference_transforms.append({
-            'type': 'matrix',
-            'matrix': mat44_from_mat33([0.451464, 0.388498, 0.160038,
-                                        0.062716, 0.866790, 0.070491,
-                                        -0.017541, 0.086921, 0.930590]),
-            'direction': 'forward'})
-    elif gamut == 'REDcolor2':
-        cs.to_reference_transforms.append({
-            'type': 'matrix',
-            'matrix': mat44_from_mat33([0.480997, 0.402289, 0.116714,
-                                        -0.004938, 1.000154, 0.004781,
-                                        -0.105257, 0.025320, 1.079907]),
-            'direction': 'forward'})
-    elif gamut == 'REDcolor3':
-        cs.to_reference_transforms.append({
-            'type': 'matrix',
-            'matrix': mat44_from_mat33([0.512136, 0.360370, 0.127494,
-                                        0.070377, 0.903884, 0.025737,
-                                        -0.020824, 0.017671, 1.003123]),
-            'direction': 'forward'})
-    elif gamut == 'REDcolor4':
-        cs.to_reference_transforms.append({
-            'type': 'matrix',
-            'matrix': mat44_from_mat33([0.474202, 0.333677, 0.192121,
-                                        0.065164, 0.836932, 0.097901,
-                                        -0.019281, 0.016362, 1.002889]),
-            'direction': 'forward'})
-    elif gamut == 'REDWideGamutRGB':
+    matrix = _GAMUT_MATRICES.get(gamut)
+    if matrix is not None:
         cs.to_reference_transforms.append({
             'type': 'matrix',
-            'matrix': mat44_from_mat33([0.785043, 0.083844, 0.131118,
-                                        0.023172, 1.087892, -0.111055,
-                                        -0.073769, -0.314639, 1.388537]),
+            'matrix': matrix,
             'direction': 'forward'})
 
     cs.from_reference_transforms = []
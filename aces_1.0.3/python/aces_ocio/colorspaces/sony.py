@@ -7,7 +7,7 @@ Implements support for *Sony* colorspaces conversions and transfer functions.
 
 from __future__ import division
 
-import array
+import numpy
 import os
 
 import PyOpenColorIO as ocio
@@ -25,6 +25,33 @@ __status__ = 'Production'
 __all__ = ['create_s_log',
            'create_colorspaces']
 
+# Transfer function, resolution and path of the LUTs written by
+# :func:`create_s_log`.
+_WRITTEN_LUTS = set()
+
+# Matrices converting the *Sony* camera gamuts to *ACES AP0*.
+_GAMUT_MATRICES = {
+    'S-Gamut': mat44_from_mat33([
+        0.754338638, 0.133697046, 0.111968437,
+        0.021198141, 1.005410934, -0.026610548,
+        -0.009756991, 0.004508563, 1.005253201]),
+    'S-Gamut Daylight': mat44_from_mat33([
+        0.8764457030, 0.0145411681, 0.1090131290,
+        0.0774075345, 0.9529571767, -0.0303647111,
+        0.0573564351, -0.1151066335, 1.0577501984]),
+    'S-Gamut Tungsten': mat44_from_mat33([
+        1.0110238740, -0.1362526051, 0.1252287310,
+        0.1011994504, 0.9562196265, -0.0574190769,
+        0.0600766530, -0.1010185315, 1.0409418785]),
+    'S-Gamut3.Cine': mat44_from_mat33([
+        0.6387886672, 0.2723514337, 0.0888598992,
+        -0.0039159061, 1.0880732308, -0.0841573249,
+        -0.0299072021, -0.0264325799, 1.0563397820]),
+    'S-Gamut3': mat44_from_mat33([
+        0.7529825954, 0.1433702162, 0.1036471884,
+        0.0217076974, 1.0153188355, -0.0370265329,
+        -0.0094160528, 0.0033704179, 1.0060456349])}
+
 
 def create_s_log(gamut,
                  transfer_function,
@@ -83,14 +110,14 @@ def create_s_log(gamut,
         ab = 90.
         w = 940.
 
-        if s_log >= ab:
-            linear = ((pow(10.,
-                           (((s_log - b) /
-                             (w - b) - 0.616596 - 0.03) / 0.432699)) -
-                       0.037584) * 0.9)
-        else:
-            linear = (((s_log - b) / (
-                w - b) - 0.030001222851889303) / 5.) * 0.9
+        linear = numpy.where(
+            s_log >= ab,
+            ((numpy.power(10.,
+                          (((s_log - b) /
+                            (w - b) - 0.616596 - 0.03) / 0.432699)) -
+              0.037584) * 0.9),
+            (((s_log - b) / (
+                w - b) - 0.030001222851889303) / 5.) * 0.9)
         return linear
 
     def s_log2_to_linear(s_log):
@@ -98,78 +125,53 @@ def create_s_log(gamut,
         ab = 90.
         w = 940.
 
-        if s_log >= ab:
-            linear = ((219. * (pow(10.,
-                                   (((s_log - b) /
-                                     (w - b) - 0.616596 - 0.03) / 0.432699)) -
-                               0.037584) / 155.) * 0.9)
-        else:
-            linear = (((s_log - b) / (
-                w - b) - 0.030001222851889303) / 3.53881278538813) * 0.9
+        linear = numpy.where(
+            s_log >= ab,
+            ((219. * (numpy.power(10.,
+                                  (((s_log - b) /
+                                    (w - b) - 0.616596 - 0.03) / 0.432699)) -
+                      0.037584) / 155.) * 0.9),
+            (((s_log - b) / (
+                w - b) - 0.030001222851889303) / 3.53881278538813) * 0.9)
         return linear
 
     def s_log3_to_linear(code_value):
-        if code_value >= 171.2102946929:
-            linear = (pow(10, ((code_value - 420) / 261.5)) *
-                      (0.18 + 0.01) - 0.01)
-        else:
-            linear = (code_value - 95) * 0.01125000 / (171.2102946929 - 95)
+        linear = numpy.where(
+            code_value >= 171.2102946929,
+            (numpy.power(10, ((code_value - 420) / 261.5)) *
+             (0.18 + 0.01) - 0.01),
+            (code_value - 95) * 0.01125000 / (171.2102946929 - 95))
 
         return linear
 
     cs.to_reference_transforms = []
 
-    if transfer_function == 'S-Log1':
-        data = array.array('f', '\0' * lut_resolution_1d * 4)
-        for c in range(lut_resolution_1d):
-            data[c] = s_log1_to_linear(1023 * c / (lut_resolution_1d - 1))
-
-        lut = '%s_to_linear.spi1d' % transfer_function
-        genlut.write_SPI_1d(
-            os.path.join(lut_directory, lut),
-            0,
-            1,
-            data,
-            lut_resolution_1d,
-            1)
-
-        cs.to_reference_transforms.append({
-            'type': 'lutFile',
-            'path': lut,
-            'interpolation': 'linear',
-            'direction': 'forward'})
-    elif transfer_function == 'S-Log2':
-        data = array.array('f', '\0' * lut_resolution_1d * 4)
-        for c in range(lut_resolution_1d):
-            data[c] = s_log2_to_linear(1023 * c / (lut_resolution_1d - 1))
-
-        lut = '%s_to_linear.spi1d' % transfer_function
-        genlut.write_SPI_1d(
-            os.path.join(lut_directory, lut),
-            0,
-            1,
-            data,
-            lut_resolution_1d,
-            1)
-
-        cs.to_reference_transforms.append({
-            'type': 'lutFile',
-            'path': lut,
-            'interpolation': 'linear',
-            'direction': 'forward'})
-    elif transfer_function == 'S-Log3':
-        data = array.array('f', '\0' * lut_resolution_1d * 4)
-        for c in range(lut_resolution_1d):
-            data[c] = s_log3_to_linear(1023 * c / (lut_resolution_1d - 1))
-
+    if transfer_function in ('S-Log1', 'S-Log2', 'S-Log3'):
         lut = '%s_to_linear.spi1d' % transfer_function
-        genlut.write_SPI_1d(
-            os.path.join(lut_directory, lut),
-            0,
-            1,
-            data,
-            lut_resolution_1d,
-            1)
+        lut_path = os.path.join(lut_directory, lut)
+
+        # The LUT is shared by all the gamuts using the transfer function.
+        lut_key = (transfer_function, lut_resolution_1d, lut_path)
+        if lut_key not in _WRITTEN_LUTS or not os.path.isfile(lut_path):
+            code_values = (1023 * numpy.arange(lut_resolution_1d) /
+                           (lut_resolution_1d - 1))
+            if transfer_function == 'S-Log1':
+                data = s_log1_to_linear(code_values)
+            elif transfer_function == 'S-Log2':
+                data = s_log2_to_linear(code_values)
+            elif transfer_function == 'S-Log3':
+                data = s_log3_to_linear(code_values)
+            data = data.astype(numpy.float32)
+
+            genlut.write_SPI_1d(
+                lut_path,
+                0,
+                1,
+                data,
+                lut_resolution_1d,
+                1)
+
+            _WRITTEN_LUTS.add(lut_key)
 
         cs.to_reference_transforms.append({
             'type': 'lutFile',
@@ -177,45 +179,11 @@ def create_s_log(gamut,
             'interpolation': 'linear',
             'direction': 'forward'})
 
-    if gamut == 'S-Gamut':
-        cs.to_reference_transforms.append({
-            'type': 'matrix',
-            'matrix': mat44_from_mat33(
-                [0.754338638, 0.133697046, 0.111968437,
-                 0.021198141, 1.005410934, -0.026610548,
-                 -0.009756991, 0.004508563, 1.005253201]),
-            'direction': 'forward'})
-    elif gamut == 'S-Gamut Daylight':
-        cs.to_reference_transforms.append({
-            'type': 'matrix',
-            'matrix': mat44_from_mat33(
-                [0.8764457030, 0.0145411681, 0.1090131290,
-                 0.0774075345, 0.9529571767, -0.0303647111,
-                 0.0573564351, -0.1151066335, 1.0577501984]),
-            'direction': 'forward'})
-    elif gamut == 'S-Gamut Tungsten':
-        cs.to_reference_transforms.append({
-            'type': 'matrix',
-            'matrix': mat44_from_mat33(
-                [1.0110238740, -0.1362526051, 0.1252287310,
-                 0.1011994504, 0.9562196265, -0.0574190769,
-                 0.0600766530, -0.1010185315, 1.0409418785]),
-            'direction': 'forward'})
-    elif gamut == 'S-Gamut3.Cine':
-        cs.to_reference_transforms.append({
-            'type': 'matrix',
-            'matrix': mat44_from_mat33(
-                [0.6387886672, 0.2723514337, 0.0888598992,
-                 -0.0039159061, 1.0880732308, -0.0841573249,
-                 -0.0299072021, -0.0264325799, 1.0563397820]),
-            'direction': 'forward'})
-    elif gamut == 'S-Gamut3':
+    matrix = _GAMUT_MATRICES.get(gamut)
+    if matrix is not None:
         cs.to_reference_transforms.append({
             'type': 'matrix',
-            'matrix': mat44_from_mat33(
-                [0.7529825954, 0.1433702162, 0.1036471884,
-                 0.0217076974, 1.0153188355, -0.0370265329,
-                 -0.0094160528, 0.0033704179, 1.0060456349]),
+            'matrix': matrix,
             'direction': 'forward'})
 
     cs.from_reference_transforms = []
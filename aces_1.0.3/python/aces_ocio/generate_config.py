@@ -57,6 +57,12 @@ __all__ = ['ACES_OCIO_CTL_DIRECTORY_ENVIRON',
 ACES_OCIO_CTL_DIRECTORY_ENVIRON = 'ACES_OCIO_CTL_DIRECTORY'
 ACES_OCIO_CONFIGURATION_DIRECTORY_ENVIRON = 'ACES_OCIO_CONFIGURATION_DIRECTORY'
 
+# *OCIO* transform directions, keyed by the direction names used in the
+# transform descriptions.
+_TRANSFORM_DIRECTIONS = {
+    'forward': ocio.Constants.TRANSFORM_DIR_FORWARD,
+    'inverse': ocio.Constants.TRANSFORM_DIR_INVERSE}
+
 
 def set_config_roles(config,
                      color_picking=None,
@@ -153,10 +159,6 @@ def create_ocio_transform(transforms):
          *OCIO* transform.
     """
 
-    direction_options = {
-        'forward': ocio.Constants.TRANSFORM_DIR_FORWARD,
-        'inverse': ocio.Constants.TRANSFORM_DIR_INVERSE}
-
     ocio_transforms = []
 
     for transform in transforms:
@@ -178,7 +180,7 @@ def create_ocio_transform(transforms):
 
             if 'direction' in transform:
                 ocio_transform.setDirection(
-                    direction_options[transform['direction']])
+                    _TRANSFORM_DIRECTIONS[transform['direction']])
 
             ocio_transforms.append(ocio_transform)
 
@@ -194,7 +196,7 @@ def create_ocio_transform(transforms):
 
             if 'direction' in transform:
                 ocio_transform.setDirection(
-                    direction_options[transform['direction']])
+                    _TRANSFORM_DIRECTIONS[transform['direction']])
 
             ocio_transforms.append(ocio_transform)
 
@@ -216,7 +218,7 @@ def create_ocio_transform(transforms):
 
             if 'direction' in transform:
                 ocio_transform.setDirection(
-                    direction_options[transform['direction']])
+                    _TRANSFORM_DIRECTIONS[transform['direction']])
 
             ocio_transforms.append(ocio_transform)
 
@@ -232,7 +234,7 @@ def create_ocio_transform(transforms):
 
             if 'direction' in transform:
                 ocio_transform.setDirection(
-                    direction_options[transform['direction']])
+                    _TRANSFORM_DIRECTIONS[transform['direction']])
 
             ocio_transforms.append(ocio_transform)
 
@@ -250,7 +252,7 @@ def create_ocio_transform(transforms):
 
             if 'direction' in transform:
                 ocio_transform.setDirection(
-                    direction_options[transform['direction']])
+                    _TRANSFORM_DIRECTIONS[transform['direction']])
 
             ocio_transforms.append(ocio_transform)
 
@@ -927,8 +929,10 @@ def create_config(config_data,
     # *Output Transform* *View*.
     default_display_name = config_data['defaultDisplay']
 
-    # Defining *Displays* and *Views*.
+    # Defining *Displays* and *Views*, the *Views* order is preserved while
+    # their membership is tested against a set.
     displays, views = [], []
+    unique_views = set()
 
     # Defining a generic *Display* and *View* setup.
     if multiple_displays:
@@ -952,7 +956,8 @@ def create_config(config_data,
                                       colorspace.name, looks)
                 else:
                     config.addDisplay(display, view_name, colorspace.name)
-                if not (view_name in views):
+                if view_name not in unique_views:
+                    unique_views.add(view_name)
                     views.append(view_name)
             displays.append(display)
 
@@ -1003,7 +1008,8 @@ def create_config(config_data,
                                               sanitised_display,
                                               colorspace.name)
 
-                            if not (sanitised_display in views):
+                            if sanitised_display not in unique_views:
+                                unique_views.add(sanitised_display)
                                 views.append(sanitised_display)
 
                     # *View* without *Looks*.
@@ -1012,7 +1018,8 @@ def create_config(config_data,
                                           sanitised_display,
                                           colorspace.name)
 
-                        if not (sanitised_display in views):
+                        if sanitised_display not in unique_views:
+                            unique_views.add(sanitised_display)
                             views.append(sanitised_display)
 
         # Adding to the configuration any *Display*, *View* combinations that
@@ -1027,7 +1034,8 @@ def create_config(config_data,
                               sanitised_display,
                               colorspace_name)
 
-            if not (sanitised_display in views):
+            if sanitised_display not in unique_views:
+                unique_views.add(sanitised_display)
                 views.append(sanitised_display)
 
         raw_display_space_name = config_data['roles']['data']
@@ -1596,8 +1604,10 @@ def generate_config(aces_ctl_directory,
                            custom_lut_dir=custom_lut_dir)
     print('\n\n\n')
 
+    # The configuration has already been sanity checked by `create_config`.
     write_config(config,
-                 os.path.join(config_directory, 'config.ocio'))
+                 os.path.join(config_directory, 'config.ocio'),
+                 sanity_check=False)
 
     if bake_secondary_luts:
         generate_baked_LUTs(odt_info,
@@ -8,8 +8,10 @@ formats.
 
 from __future__ import division
 
-import array
+import numpy
 import os
+import shutil
+import tempfile
 
 import OpenImageIO as oiio
 
@@ -37,11 +39,146 @@ __all__ = ['generate_1d_LUT_image',
            'generate_3d_LUT_from_CTL',
            'main']
 
+# Cache of the *ctlrender* *-global_param1* arguments, keyed by the sorted
+# global parameters items.
+_GLOBAL_PARAMS_ARGUMENTS_CACHE = {}
+
+# Row formats of the *spi1d* and *csp* 1D LUT files, keyed by the count of
+# components of the LUT.
+_SPI_1D_ROW_FORMATS = dict((components, '        %s\n' % (' %s' * components))
+                           for components in (1, 2, 3))
+
+_CSP_1D_ROW_FORMATS = dict((components, '%s\n' % (' %s' * components))
+                           for components in (1, 2, 3))
+
+# File extensions of the 3D LUT formats *ociobakelut* can write, keyed by
+# format name.
+_OCIO_3D_LUT_FORMATS_TO_EXTENSIONS = {
+    'cinespace': 'csp',
+    'flame': '3dl',
+    'icc': 'icc',
+    'houdini': 'lut',
+    'lustre': '3dl'}
+
+# Templates of the *CTL* 1D LUT files prologue and *main* function.
+_CTL_1D_HEADER_TEMPLATE = """// %(entries)d x %(components)d LUT generated by "generate_lut"
+
+const float min1d = %(from_min)3.9f;
+const float max1d = %(from_max)3.9f;
+
+"""
+
+_CTL_1D_MAIN_TEMPLATE = """void main
+(
+  input varying float rIn,
+  input varying float gIn,
+  input varying float bIn,
+  input varying float aIn,
+  output varying float rOut,
+  output varying float gOut,
+  output varying float bOut,
+  output varying float aOut
+)
+{
+  float r = rIn;
+  float g = gIn;
+  float b = bIn;
+
+  // Apply LUT
+%(lookups)s
+  rOut = r;
+  gOut = g;
+  bOut = b;
+  aOut = aIn;
+}
+"""
+
+# *CTL* 1D LUT lookups, keyed by the count of components of the LUT.
+_CTL_1D_LOOKUPS = {
+    1: ('  r = lookup1D(lut, min1d, max1d, r);\n'
+        '  g = lookup1D(lut, min1d, max1d, g);\n'
+        '  b = lookup1D(lut, min1d, max1d, b);\n'),
+    3: ('  r = lookup1D(lut0, min1d, max1d, r);\n'
+        '  g = lookup1D(lut1, min1d, max1d, g);\n'
+        '  b = lookup1D(lut2, min1d, max1d, b);\n')}
+
+# *OpenImageIO* pixel data types and bits per sample, for the sub-byte aligned
+# ones, of the bit depths LUT images can be written with.
+_BIT_DEPTHS = {'uint8': (oiio.UINT8, None),
+               'sint8': (oiio.INT8, None),
+               'uint10': (oiio.UINT16, 10),
+               'uint12': (oiio.UINT16, 12),
+               'uint16': (oiio.UINT16, None),
+               'sint16': (oiio.INT16, None),
+               'half': (oiio.HALF, None),
+               'float': (oiio.FLOAT, None),
+               'double': (oiio.DOUBLE, None)}
+
+# Parent directory of the scratch directories holding the intermediate images
+# that are removed once their LUT is generated, *tmpfs* is used when available.
+_SCRATCH_ROOT = '/dev/shm' if os.path.isdir('/dev/shm') else None
+
+
+def _scratch_directory():
+    """
+    Creates a scratch directory for intermediate images.
+
+    Returns
+    -------
+    str or unicode
+        The path of the scratch directory, the caller is responsible for
+        removing it.
+    """
+
+    return tempfile.mkdtemp(prefix='aces_ocio_', dir=_SCRATCH_ROOT)
+
+
+def _write_LUT_image(path, data, bit_depth='float'):
+    """
+    Writes given LUT image data to an image with given bit depth.
+
+    Parameters
+    ----------
+    path : str or unicode
+        The path of the image to be written.
+    data : ndarray
+        The image data as a *float32* array of shape (height, width, channels).
+    bit_depth : str or unicode, optional
+        The bit depth of the image to be written.
+        Data types include: uint8, sint8, uint10, uint12, uint16, sint16,
+        half, float, double. Other bit depths are written as float and
+        converted by :func:`convert_bit_depth`.
+    """
+
+    if bit_depth not in _BIT_DEPTHS:
+        float_path = '%s.float%s' % os.path.splitext(path)
+        _write_LUT_image(float_path, data)
+        try:
+            convert_bit_depth(float_path, path, bit_depth)
+        finally:
+            os.remove(float_path)
+        return
+
+    data_type, bits_per_sample = _BIT_DEPTHS[bit_depth]
+
+    image = oiio.ImageOutput.create(path)
+
+    spec = oiio.ImageSpec()
+    spec.set_format(data_type)
+    spec.height, spec.width, spec.nchannels = data.shape
+    if bits_per_sample is not None:
+        spec.attribute('oiio:BitsPerSample', bits_per_sample)
+
+    image.open(path, spec, oiio.Create)
+    image.write_image(oiio.FLOAT, data)
+    image.close()
+
 
 def generate_1d_LUT_image(ramp_1d_path,
                           resolution=1024,
                           min_value=0,
-                          max_value=1):
+                          max_value=1,
+                          bit_depth='float'):
     """
     Generates a 1D LUT image, i.e. a simple ramp, going from the min_value to 
     the max_value.
@@ -56,30 +193,34 @@ def generate_1d_LUT_image(ramp_1d_path,
         The lowest value in the 1D ramp.
     max_value : float, optional
         The highest value in the 1D ramp.
+    bit_depth : str or unicode, optional
+        The bit depth of the 1D ramp image to be written.
     """
 
-    ramp = oiio.ImageOutput.create(ramp_1d_path)
+    values = numpy.arange(resolution) / (resolution - 1) * (
+        max_value - min_value) + min_value
+    data = numpy.empty((1, resolution, 3), dtype=numpy.float32)
+    data[:] = values[:, numpy.newaxis]
 
-    spec = oiio.ImageSpec()
-    spec.set_format(oiio.FLOAT)
-    # spec.format.basetype = oiio.FLOAT
-    spec.width = resolution
-    spec.height = 1
-    spec.nchannels = 3
+    _write_LUT_image(ramp_1d_path, data, bit_depth)
 
-    ramp.open(ramp_1d_path, spec, oiio.Create)
 
-    data = array.array('f',
-                       '\0' * spec.width * spec.height * spec.nchannels * 4)
-    for i in range(resolution):
-        value = float(i) / (resolution - 1) * (
-            max_value - min_value) + min_value
-        data[i * spec.nchannels + 0] = value
-        data[i * spec.nchannels + 1] = value
-        data[i * spec.nchannels + 2] = value
+def _flat_LUT_data(data):
+    """
+    Returns given LUT data as a flat list of *Python* floats.
 
-    ramp.write_image(spec.format, data)
-    ramp.close()
+    Parameters
+    ----------
+    data : array_like
+        The entries in the LUT.
+
+    Returns
+    -------
+    list of float
+        The flattened LUT entries.
+    """
+
+    return numpy.ravel(data).tolist()
 
 
 def write_SPI_1d(filename,
@@ -117,17 +258,18 @@ def write_SPI_1d(filename,
     # Most commonly used for single channel LUTs
     components = min(3, components, channels)
 
+    data = _flat_LUT_data(data)
+    row_format = _SPI_1D_ROW_FORMATS[components]
+
     with open(filename, 'w') as fp:
         fp.write('Version 1\n')
         fp.write('From %f %f\n' % (from_min, from_max))
         fp.write('Length %d\n' % entries)
         fp.write('Components %d\n' % components)
         fp.write('{\n')
-        for i in range(0, entries):
-            entry = ''
-            for j in range(0, components):
-                entry = '%s %s' % (entry, data[i * channels + j])
-            fp.write('        %s\n' % entry)
+        fp.write(''.join(
+            row_format % tuple(data[i * channels:i * channels + components])
+            for i in range(entries)))
         fp.write('}\n')
 
 
@@ -163,6 +305,8 @@ def write_CSP_1d(filename,
     # Most commonly used for single channel LUTs
     components = min(3, components, channels)
 
+    data = _flat_LUT_data(data)
+
     with open(filename, 'w') as fp:
         fp.write('CSPLUTV100\n')
         fp.write('1D\n')
@@ -172,31 +316,22 @@ def write_CSP_1d(filename,
 
         fp.write('\n')
 
-        fp.write('2\n')
-        fp.write('%f %f\n' % (from_min, from_max))
-        fp.write('0.0 1.0\n')
-        fp.write('2\n')
-        fp.write('%f %f\n' % (from_min, from_max))
-        fp.write('0.0 1.0\n')
-        fp.write('2\n')
-        fp.write('%f %f\n' % (from_min, from_max))
-        fp.write('0.0 1.0\n')
+        # Pre-LUT, identical for the three channels.
+        fp.write(('2\n%f %f\n0.0 1.0\n' % (from_min, from_max)) * 3)
 
         fp.write('\n')
 
         fp.write('%d\n' % entries)
         if components == 1:
-            for i in range(0, entries):
-                entry = ''
-                for j in range(3):
-                    entry = '%s %s' % (entry, data[i * channels])
-                fp.write('%s\n' % entry)
+            row_format = _CSP_1D_ROW_FORMATS[3]
+            fp.write(''.join(row_format % ((data[i * channels],) * 3)
+                             for i in range(entries)))
         else:
-            for i in range(entries):
-                entry = ''
-                for j in range(components):
-                    entry = '%s %s' % (entry, data[i * channels + j])
-                fp.write('%s\n' % entry)
+            row_format = _CSP_1D_ROW_FORMATS[components]
+            fp.write(''.join(
+                row_format % tuple(
+                    data[i * channels:i * channels + components])
+                for i in range(entries)))
         fp.write('\n')
 
 
@@ -232,66 +367,29 @@ def write_CTL_1d(filename,
     # Most commonly used for single channel LUTs
     components = min(3, components, channels)
 
+    data = _flat_LUT_data(data)
+
     with open(filename, 'w') as fp:
-        fp.write('// %d x %d LUT generated by "generate_lut"\n' % (
-            entries, components))
-        fp.write('\n')
-        fp.write('const float min1d = %3.9f;\n' % from_min)
-        fp.write('const float max1d = %3.9f;\n' % from_max)
-        fp.write('\n')
+        fp.write(_CTL_1D_HEADER_TEMPLATE % {'entries': entries,
+                                            'components': components,
+                                            'from_min': from_min,
+                                            'from_max': from_max})
 
         # Write LUT
+        lut = ',\n'.join(map(str, data[0:entries * channels:channels]))
         if components == 1:
-            fp.write('const float lut[] = {\n')
-            for i in range(0, entries):
-                fp.write('%s' % data[i * channels])
-                if i != (entries - 1):
-                    fp.write(',')
-                fp.write('\n')
-            fp.write('};\n')
-            fp.write('\n')
+            fp.write('const float lut[] = {\n%s\n};\n\n' % lut)
         else:
             for j in range(components):
-                fp.write('const float lut%d[] = {\n' % j)
-                for i in range(0, entries):
-                    fp.write('%s' % data[i * channels])
-                    if i != (entries - 1):
-                        fp.write(',')
-                    fp.write('\n')
-                fp.write('};\n')
-                fp.write('\n')
-
-        fp.write('void main\n')
-        fp.write('(\n')
-        fp.write('  input varying float rIn,\n')
-        fp.write('  input varying float gIn,\n')
-        fp.write('  input varying float bIn,\n')
-        fp.write('  input varying float aIn,\n')
-        fp.write('  output varying float rOut,\n')
-        fp.write('  output varying float gOut,\n')
-        fp.write('  output varying float bOut,\n')
-        fp.write('  output varying float aOut\n')
-        fp.write(')\n')
-        fp.write('{\n')
-        fp.write('  float r = rIn;\n')
-        fp.write('  float g = gIn;\n')
-        fp.write('  float b = bIn;\n')
-        fp.write('\n')
-        fp.write('  // Apply LUT\n')
-        if components == 1:
-            fp.write('  r = lookup1D(lut, min1d, max1d, r);\n')
-            fp.write('  g = lookup1D(lut, min1d, max1d, g);\n')
-            fp.write('  b = lookup1D(lut, min1d, max1d, b);\n')
-        elif components == 3:
-            fp.write('  r = lookup1D(lut0, min1d, max1d, r);\n')
-            fp.write('  g = lookup1D(lut1, min1d, max1d, g);\n')
-            fp.write('  b = lookup1D(lut2, min1d, max1d, b);\n')
-        fp.write('\n')
-        fp.write('  rOut = r;\n')
-        fp.write('  gOut = g;\n')
-        fp.write('  bOut = b;\n')
-        fp.write('  aOut = aIn;\n')
-        fp.write('}\n')
+                fp.write('const float lut%d[] = {\n%s\n};\n\n' % (j, lut))
+
+        fp.write(_CTL_1D_MAIN_TEMPLATE % {
+            'lookups': _CTL_1D_LOOKUPS.get(components, '')})
+
+
+# 1D LUT writers keyed by format name, any other format is written as *spi1d*.
+_1D_LUT_WRITERS = {'cinespace': write_CSP_1d,
+                   'ctl': write_CTL_1d}
 
 
 def write_1d(filename,
@@ -325,39 +423,13 @@ def write_1d(filename,
         The format of the the 1D LUT that will be written.
     """
 
-    ocio_formats_to_extensions = {
-        'cinespace': 'csp',
-        'flame': '3dl',
-        'icc': 'icc',
-        'houdini': 'lut',
-        'lustre': '3dl',
-        'ctl': 'ctl'}
-
-    if format in ocio_formats_to_extensions:
-        if ocio_formats_to_extensions[format] == 'csp':
-            write_CSP_1d(filename,
-                         from_min,
-                         from_max,
-                         data,
-                         data_entries,
-                         data_channels,
-                         lut_components)
-        elif ocio_formats_to_extensions[format] == 'ctl':
-            write_CTL_1d(filename,
-                         from_min,
-                         from_max,
-                         data,
-                         data_entries,
-                         data_channels,
-                         lut_components)
-    else:
-        write_SPI_1d(filename,
-                     from_min,
-                     from_max,
-                     data,
-                     data_entries,
-                     data_channels,
-                     lut_components)
+    _1D_LUT_WRITERS.get(format, write_SPI_1d)(filename,
+                                              from_min,
+                                              from_max,
+                                              data,
+                                              data_entries,
+                                              data_channels,
+                                              lut_components)
 
 
 def generate_1d_LUT_from_image(ramp_1d_path,
@@ -403,11 +475,14 @@ def generate_1d_LUT_from_image(ramp_1d_path,
              ramp_data, ramp_width, ramp_channels, channels, format)
 
 
-def generate_3d_LUT_image(ramp_3d_path, resolution=32):
+def generate_3d_LUT_image(ramp_3d_path, resolution=32, bit_depth='float'):
     """
     Generates a 3D LUT image covering the specified resolution
 
-    Relies on *OCIO* *ociolutimage* command.
+    The image layout matches the one of *OCIO* *ociolutimage* command
+    *--generate* option, i.e. a *resolution * resolution* wide and
+    *resolution* high image where the red channel varies the fastest, so that
+    it can be read back by *ociolutimage* *--extract* option.
 
     Parameters
     ----------
@@ -415,19 +490,18 @@ def generate_3d_LUT_image(ramp_3d_path, resolution=32):
         The path of the 3D ramp image to be written.
     resolution : int, optional
         The resolution of the 3D ramp image to be written.
+    bit_depth : str or unicode, optional
+        The bit depth of the 3D ramp image to be written.
     """
 
-    args = ['--generate',
-            '--cubesize',
-            str(resolution),
-            '--maxwidth',
-            str(resolution * resolution),
-            '--output',
-            ramp_3d_path]
-    lut_extract = Process(description='generate a 3d LUT image',
-                          cmd='ociolutimage',
-                          args=args)
-    lut_extract.execute()
+    # Single precision computations, as performed by *ociolutimage*.
+    values = numpy.arange(resolution, dtype=numpy.float32) * (
+        numpy.float32(1) / numpy.float32(resolution - 1))
+    blue, green, red = numpy.meshgrid(values, values, values, indexing='ij')
+    data = numpy.stack((red, green, blue), axis=-1).reshape(
+        resolution, resolution * resolution, 3)
+
+    _write_LUT_image(ramp_3d_path, data, bit_depth)
 
 
 def generate_3d_LUT_from_image(ramp_3d_path,
@@ -454,47 +528,31 @@ def generate_3d_LUT_from_image(ramp_3d_path,
     if output_path is None:
         output_path = '%s.%s' % (ramp_3d_path, 'spi3d')
 
-    ocio_formats_to_extensions = {
-        'cinespace': 'csp',
-        'flame': '3dl',
-        'icc': 'icc',
-        'houdini': 'lut',
-        'lustre': '3dl'}
-
-    if format == 'spi3d' or not (format in ocio_formats_to_extensions):
-        # Extract a spi3d LUT
-        args = ['--extract',
-                '--cubesize',
-                str(resolution),
-                '--maxwidth',
-                str(resolution * resolution),
-                '--input',
-                ramp_3d_path,
-                '--output',
-                output_path]
-        lut_extract = Process(description='extract a 3d LUT',
-                              cmd='ociolutimage',
-                              args=args)
-        lut_extract.execute()
-
-    else:
+    # Formats other than *spi3d* are converted from an intermediate *spi3d*
+    # LUT.
+    convert = (format != 'spi3d' and
+               format in _OCIO_3D_LUT_FORMATS_TO_EXTENSIONS)
+    if convert:
         output_path_spi3d = '%s.%s' % (output_path, 'spi3d')
+    else:
+        output_path_spi3d = output_path
 
-        # Extract a spi3d LUT
-        args = ['--extract',
-                '--cubesize',
-                str(resolution),
-                '--maxwidth',
-                str(resolution * resolution),
-                '--input',
-                ramp_3d_path,
-                '--output',
-                output_path_spi3d]
-        lut_extract = Process(description='extract a 3d LUT',
-                              cmd='ociolutimage',
-                              args=args)
-        lut_extract.execute()
+    # Extract a spi3d LUT
+    args = ['--extract',
+            '--cubesize',
+            str(resolution),
+            '--maxwidth',
+            str(resolution * resolution),
+            '--input',
+            ramp_3d_path,
+            '--output',
+            output_path_spi3d]
+    lut_extract = Process(description='extract a 3d LUT',
+                          cmd='ociolutimage',
+                          args=args)
+    lut_extract.execute()
 
+    if convert:
         # Convert to a different format
         args = ['--lut',
                 output_path_spi3d,
@@ -507,6 +565,34 @@ def generate_3d_LUT_from_image(ramp_3d_path,
         lut_convert.execute()
 
 
+def _global_params_arguments(global_params):
+    """
+    Returns the *ctlrender* *-global_param1* arguments for given global
+    parameters.
+
+    Parameters
+    ----------
+    global_params : dict of key value pairs
+        The set of parameter names and values to pass to the *ctlrender*
+        *-global_param1* parameter.
+
+    Returns
+    -------
+    tuple of str or unicode
+        The *ctlrender* arguments.
+    """
+
+    key = tuple(sorted(global_params.items()))
+    arguments = _GLOBAL_PARAMS_ARGUMENTS_CACHE.get(key)
+    if arguments is None:
+        arguments = tuple(argument
+                          for name, value in key
+                          for argument in ('-global_param1', name, str(value)))
+        _GLOBAL_PARAMS_ARGUMENTS_CACHE[key] = arguments
+
+    return arguments
+
+
 def apply_CTL_to_image(input_image,
                        output_image,
                        ctl_paths=None,
@@ -553,7 +639,7 @@ def apply_CTL_to_image(input_image,
         global_params = {}
 
     if len(ctl_paths) > 0:
-        ctlenv = os.environ
+        ctlenv = os.environ.copy()
 
         if "/usr/local/bin" not in ctlenv['PATH'].split(':'):
             ctlenv['PATH'] = "%s:/usr/local/bin" % ctlenv['PATH']
@@ -567,17 +653,13 @@ def apply_CTL_to_image(input_image,
                 ctl_module_path = aces_ctl_directory
             ctlenv['CTL_MODULE_PATH'] = ctl_module_path
 
-        args = []
-        for ctl in ctl_paths:
-            args += ['-ctl', ctl]
-        args += ['-force']
-        args += ['-input_scale', str(input_scale)]
-        args += ['-output_scale', str(output_scale)]
-        args += ['-global_param1', 'aIn', '1.0']
-        for key, value in global_params.iteritems():
-            args += ['-global_param1', key, str(value)]
-        args += [input_image]
-        args += [output_image]
+        args = [argument for ctl in ctl_paths for argument in ('-ctl', ctl)]
+        args += ['-force',
+                 '-input_scale', str(input_scale),
+                 '-output_scale', str(output_scale),
+                 '-global_param1', 'aIn', '1.0']
+        args += _global_params_arguments(global_params)
+        args += [input_image, output_image]
 
         ctlp = Process(description='a ctlrender process',
                        cmd='ctlrender',
@@ -590,7 +672,8 @@ def convert_bit_depth(input_image, output_image, depth):
     """
     Convert the input image to the specified bit depth and write a new image.
 
-    Relies on the OIIO oiiotool command.
+    The conversion happens in-process through *OpenImageIO*, the OIIO
+    oiiotool command is only used for bit depths unknown to this module.
 
     Parameters
     ----------
@@ -604,15 +687,33 @@ def convert_bit_depth(input_image, output_image, depth):
         half, float, double.
     """
 
-    args = [input_image,
-            '-d',
-            depth,
-            '-o',
-            output_image]
-    convert = Process(description='convert image bit depth',
-                      cmd='oiiotool',
-                      args=args)
-    convert.execute()
+    if depth not in _BIT_DEPTHS:
+        args = [input_image,
+                '-d',
+                depth,
+                '-o',
+                output_image]
+        convert = Process(description='convert image bit depth',
+                          cmd='oiiotool',
+                          args=args)
+        convert.execute()
+        return
+
+    source = oiio.ImageInput.open(input_image)
+
+    source_spec = source.spec()
+
+    # Forcibly read data as float, the Python API doesn't handle half-float
+    # well yet.
+    source_data = source.read_image(oiio.FLOAT)
+    source.close()
+
+    _write_LUT_image(output_image,
+                     numpy.asarray(source_data, dtype=numpy.float32).reshape(
+                         source_spec.height,
+                         source_spec.width,
+                         source_spec.nchannels),
+                     depth)
 
 
 def generate_1d_LUT_from_CTL(lut_path,
@@ -677,41 +778,47 @@ def generate_1d_LUT_from_CTL(lut_path,
 
     lut_path_base = os.path.splitext(lut_path)[0]
 
-    identity_lut_image_float = '%s.%s.%s' % (lut_path_base, 'float', 'tiff')
-    generate_1d_LUT_image(identity_lut_image_float,
-                          lut_resolution,
-                          min_value,
-                          max_value)
-
-    if identity_lut_bit_depth not in ['half', 'float']:
-        identity_lut_image = '%s.%s.%s' % (lut_path_base, 'uint16', 'tiff')
-        convert_bit_depth(identity_lut_image_float,
-                          identity_lut_image,
-                          identity_lut_bit_depth)
-    else:
-        identity_lut_image = identity_lut_image_float
-
-    transformed_lut_image = '%s.%s.%s' % (lut_path_base, 'transformed', 'exr')
-    apply_CTL_to_image(identity_lut_image,
-                       transformed_lut_image,
-                       ctl_paths,
-                       input_scale,
-                       output_scale,
-                       global_params,
-                       aces_ctl_directory)
-
-    generate_1d_LUT_from_image(transformed_lut_image,
-                               lut_path,
-                               min_value,
-                               max_value,
-                               channels,
-                               format)
-
+    # Intermediate images that are cleaned up never leave the scratch
+    # directory, only the LUT itself is written next to the config.
     if cleanup:
-        os.remove(identity_lut_image)
-        if identity_lut_image != identity_lut_image_float:
-            os.remove(identity_lut_image_float)
-        os.remove(transformed_lut_image)
+        scratch_directory = _scratch_directory()
+        lut_path_base = os.path.join(scratch_directory,
+                                     os.path.basename(lut_path_base))
+
+    # Half-float identity LUT images are written as float.
+    if identity_lut_bit_depth in ['half', 'float']:
+        identity_lut_bit_depth = 'float'
+
+    try:
+        identity_lut_image = '%s.%s.%s' % (lut_path_base,
+                                           identity_lut_bit_depth,
+                                           'tiff')
+        generate_1d_LUT_image(identity_lut_image,
+                              lut_resolution,
+                              min_value,
+                              max_value,
+                              identity_lut_bit_depth)
+
+        transformed_lut_image = '%s.%s.%s' % (lut_path_base,
+                                              'transformed',
+                                              'exr')
+        apply_CTL_to_image(identity_lut_image,
+                           transformed_lut_image,
+                           ctl_paths,
+                           input_scale,
+                           output_scale,
+                           global_params,
+                           aces_ctl_directory)
+
+        generate_1d_LUT_from_image(transformed_lut_image,
+                                   lut_path,
+                                   min_value,
+                                   max_value,
+                                   channels,
+                                   format)
+    finally:
+        if cleanup:
+            shutil.rmtree(scratch_directory, ignore_errors=True)
 
 
 def correct_LUT_image(transformed_lut_image,
@@ -748,52 +855,44 @@ def correct_LUT_image(transformed_lut_image,
     height = transformed_spec.height
     channels = transformed_spec.nchannels
 
-    if width != lut_resolution * lut_resolution or height != lut_resolution:
-        print(('Correcting image as resolution is off. '
-               'Found %d x %d. Expected %d x %d') % (
-                  width,
-                  height,
-                  lut_resolution * lut_resolution,
-                  lut_resolution))
-        print('Generating %s' % corrected_lut_image)
-
-        # Forcibly read data as float, the Python API doesn't handle half-float
-        # well yet.
-        type = oiio.FLOAT
-        source_data = transformed.read_image(type)
-
-        correct = oiio.ImageOutput.create(corrected_lut_image)
-
-        correct_spec = oiio.ImageSpec()
-        correct_spec.set_format(oiio.FLOAT)
-        correct_spec.width = height
-        correct_spec.height = width
-        correct_spec.nchannels = channels
-
-        correct.open(corrected_lut_image, correct_spec, oiio.Create)
-
-        dest_data = array.array('f',
-                                ('\0' * correct_spec.width *
-                                 correct_spec.height *
-                                 correct_spec.nchannels * 4))
-        for j in range(0, correct_spec.height):
-            for i in range(0, correct_spec.width):
-                for c in range(0, correct_spec.nchannels):
-                    dest_data[(correct_spec.nchannels *
-                               correct_spec.width * j +
-                               correct_spec.nchannels * i + c)] = (
-                        source_data[correct_spec.nchannels *
-                                    correct_spec.width * j +
-                                    correct_spec.nchannels * i + c])
-
-        correct.write_image(correct_spec.format, dest_data)
-        correct.close()
-    else:
-        # shutil.copy(transformedLUTImage, correctedLUTImage)
-        corrected_lut_image = transformed_lut_image
+    # The common case: the image is already correctly shaped, only its header
+    # needed to be read.
+    if width == lut_resolution * lut_resolution and height == lut_resolution:
+        transformed.close()
+        return transformed_lut_image
+
+    print(('Correcting image as resolution is off. '
+           'Found %d x %d. Expected %d x %d') % (
+              width,
+              height,
+              lut_resolution * lut_resolution,
+              lut_resolution))
+    print('Generating %s' % corrected_lut_image)
 
+    # Forcibly read data as float, the Python API doesn't handle half-float
+    # well yet.
+    type = oiio.FLOAT
+    source_data = transformed.read_image(type)
     transformed.close()
 
+    correct = oiio.ImageOutput.create(corrected_lut_image)
+
+    correct_spec = oiio.ImageSpec()
+    correct_spec.set_format(oiio.FLOAT)
+    correct_spec.width = height
+    correct_spec.height = width
+    correct_spec.nchannels = channels
+
+    correct.open(corrected_lut_image, correct_spec, oiio.Create)
+
+    # The pixels are already in the right order, only the width and height
+    # of the image need to be swapped.
+    dest_data = numpy.asarray(source_data, dtype=numpy.float32).reshape(
+        correct_spec.height, correct_spec.width, correct_spec.nchannels)
+
+    correct.write_image(correct_spec.format, dest_data)
+    correct.close()
+
     return corrected_lut_image
 
 
@@ -850,45 +949,50 @@ def generate_3d_LUT_from_CTL(lut_path,
 
     lut_path_base = os.path.splitext(lut_path)[0]
 
-    identity_lut_image_float = '%s.%s.%s' % (lut_path_base, 'float', 'tiff')
-    generate_3d_LUT_image(identity_lut_image_float, lut_resolution)
+    # Intermediate images that are cleaned up never leave the scratch
+    # directory, only the LUT itself is written next to the config.
+    if cleanup:
+        scratch_directory = _scratch_directory()
+        lut_path_base = os.path.join(scratch_directory,
+                                     os.path.basename(lut_path_base))
+
+    # Half-float identity LUT images are written as float.
+    if identity_lut_bit_depth in ['half', 'float']:
+        identity_lut_bit_depth = 'float'
 
-    if identity_lut_bit_depth not in ['half', 'float']:
+    try:
         identity_lut_image = '%s.%s.%s' % (lut_path_base,
                                            identity_lut_bit_depth,
                                            'tiff')
-        convert_bit_depth(identity_lut_image_float,
-                          identity_lut_image,
-                          identity_lut_bit_depth)
-    else:
-        identity_lut_image = identity_lut_image_float
-
-    transformed_lut_image = '%s.%s.%s' % (lut_path_base, 'transformed', 'exr')
-    apply_CTL_to_image(identity_lut_image,
-                       transformed_lut_image,
-                       ctl_paths,
-                       input_scale,
-                       output_scale,
-                       global_params,
-                       aces_ctl_directory)
-
-    corrected_lut_image = '%s.%s.%s' % (lut_path_base, 'correct', 'exr')
-    corrected_lut_image = correct_LUT_image(transformed_lut_image,
-                                            corrected_lut_image,
-                                            lut_resolution)
-
-    generate_3d_LUT_from_image(corrected_lut_image,
-                               lut_path,
-                               lut_resolution,
-                               format)
+        generate_3d_LUT_image(identity_lut_image,
+                              lut_resolution,
+                              identity_lut_bit_depth)
+
+        transformed_lut_image = '%s.%s.%s' % (lut_path_base,
+                                              'transformed',
+                                              'exr')
+        apply_CTL_to_image(identity_lut_image,
+                           transformed_lut_image,
+                           ctl_paths,
+                           input_scale,
+                           output_scale,
+                           global_params,
+                           aces_ctl_directory)
+
+        corrected_lut_image = '%s.%s.%s' % (lut_path_base, 'correct', 'exr')
+        corrected_lut_image = correct_LUT_image(transformed_lut_image,
+                                                corrected_lut_image,
+                                                lut_resolution)
+
+        generate_3d_LUT_from_image(corrected_lut_image,
+                                   lut_path,
+                                   lut_resolution,
+                                   format)
+    finally:
+        if cleanup:
+            shutil.rmtree(scratch_directory, ignore_errors=True)
 
     if cleanup:
-        os.remove(identity_lut_image)
-        if identity_lut_image != identity_lut_image_float:
-            os.remove(identity_lut_image_float)
-        os.remove(transformed_lut_image)
-        if corrected_lut_image != transformed_lut_image:
-            os.remove(corrected_lut_image)
         if format != 'spi3d':
             lut_path_spi3d = '%s.%s' % (lut_path, 'spi3d')
             os.remove(lut_path_spi3d)
@@ -8,9 +8,21 @@ a process or a list of other process wrappers which carry such data.
 
 from __future__ import division
 
+import datetime
+import multiprocessing
 import os
+import platform
+import subprocess
 import sys
+import tempfile
+import time
 import traceback
+from multiprocessing.pool import ThreadPool
+
+try:
+    from cStringIO import StringIO
+except ImportError:
+    from io import StringIO
 
 __author__ = 'ACES Developers'
 __copyright__ = 'Copyright (C) 2014 - 2016 - ACES Developers'
@@ -19,12 +31,27 @@ __maintainer__ = 'ACES Developers'
 __email__ = 'aces@oscars.org'
 __status__ = 'Production'
 
-__all__ = ['read_text',
+__all__ = ['ECHO_BUFFER_SIZE',
+           'LOG_BUFFER_SIZE',
+           'read_text',
            'write_text',
            'Process',
            'ProcessList',
            'main']
 
+# Clock used to measure the processes elapsed time, *time.monotonic* is not
+# available on *Python 2*.
+_timer = getattr(time, 'monotonic', time.time)
+
+# Log indentations, indexed by indentation level.
+_INDENTS = tuple('\t' * level for level in range(16))
+
+# Count of log lines buffered before they are echoed to the standard output.
+ECHO_BUFFER_SIZE = 64
+
+# Size in bytes of the buffer of the log files written to disk.
+LOG_BUFFER_SIZE = 1 << 20
+
 
 def read_text(text_file):
     """
@@ -78,6 +105,100 @@ def write_text(text, text_file):
     return text
 
 
+def _decode_output(output):
+    """
+    Decodes given process output to text.
+
+    Parameters
+    ----------
+    output : bytes
+        Process output.
+
+    Returns
+    -------
+    str or unicode
+         Process output text, left untouched on *Python 2*.
+    """
+
+    if sys.version_info[0] >= 3:
+        return output.decode('utf-8', 'replace')
+
+    return output
+
+
+def _indent(level):
+    """
+    Returns the log indentation for given level.
+
+    Parameters
+    ----------
+    level : int
+        Indentation level.
+
+    Returns
+    -------
+    str or unicode
+         Indentation.
+    """
+
+    if level < len(_INDENTS):
+        return _INDENTS[level]
+
+    return '\t' * level
+
+
+def _write_key_xml(log_handle, indent, key, value=None, start_stop=None):
+    """
+    Writes a key / value pair in the *xml* format.
+
+    Parameters
+    ----------
+    log_handle : file
+        Handle to write to.
+    indent : str or unicode
+        Indentation of the written line.
+    key : str or unicode
+        Key to write.
+    value : object, optional
+        Value to write.
+    start_stop : str or unicode, optional
+        {'start', 'stop'}, write an opening or closing tag only.
+    """
+
+    if start_stop == 'start':
+        log_handle.write('%s<%s>\n' % (indent, key))
+    elif start_stop == 'stop':
+        log_handle.write('%s</%s>\n' % (indent, key))
+    else:
+        log_handle.write('%s<%s>%s</%s>\n' % (indent, key, value, key))
+
+
+def _write_key_text(log_handle, indent, key, value=None, start_stop=None):
+    """
+    Writes a key / value pair in the *text* format.
+
+    Parameters
+    ----------
+    log_handle : file
+        Handle to write to.
+    indent : str or unicode
+        Indentation of the written line.
+    key : str or unicode
+        Key to write.
+    value : object, optional
+        Value to write.
+    start_stop : str or unicode, optional
+        Unused, for signature compatibility with :func:`_write_key_xml`.
+    """
+
+    log_handle.write('%s%40s : %s\n' % (indent, key, value))
+
+
+# Key / value pair writers keyed by log format, formats other than *xml* are
+# written as *text*.
+_KEY_WRITERS = {'xml': _write_key_xml}
+
+
 class Process:
     """
     A process with logged output.
@@ -116,11 +237,17 @@ class Process:
         self.args = args
         self.start = None
         self.end = None
+        self.start_time = None
+        self.end_time = None
         self.log = []
         self.echo = True
+        self.echo_buffer = []
         self.cwd = cwd
         self.env = env
         self.batch_wrapper = batch_wrapper
+        # Process lists holding this process, their reports are flagged as
+        # outdated whenever it executes.
+        self._process_lists = []
         self.process_keys = []
 
     def get_elapsed_seconds(self):
@@ -138,12 +265,8 @@ class Process:
              Return value description.
         """
 
-        import math
-
-        if self.end and self.start:
-            delta = (self.end - self.start)
-            formatted = '%s.%s' % (delta.days * 86400 + delta.seconds,
-                                   int(math.floor(delta.microseconds / 1e3)))
+        if self.end_time is not None and self.start_time is not None:
+            formatted = '%.3f' % (self.end_time - self.start_time)
         else:
             formatted = None
         return formatted
@@ -164,18 +287,11 @@ class Process:
         """
 
         if key is not None and (value is not None or start_stop is not None):
-            indent = '\t' * write_dict['indentationLevel']
-            if write_dict['format'] == 'xml':
-                if start_stop == 'start':
-                    write_dict['logHandle'].write('%s<%s>\n' % (indent, key))
-                elif start_stop == 'stop':
-                    write_dict['logHandle'].write('%s</%s>\n' % (indent, key))
-                else:
-                    write_dict['logHandle'].write(
-                        '%s<%s>%s</%s>\n' % (indent, key, value, key))
-            else:
-                write_dict['logHandle'].write(
-                    '%s%40s : %s\n' % (indent, key, value))
+            write_dict['keyWriter'](write_dict['logHandle'],
+                                    _indent(write_dict['indentationLevel']),
+                                    key,
+                                    value,
+                                    start_stop)
 
     def write_log_header(self, write_dict):
         """
@@ -192,8 +308,6 @@ class Process:
              Return value description.
         """
 
-        import platform
-
         try:
             user = os.getlogin()
         except:
@@ -280,7 +394,8 @@ class Process:
         write_dict = {
             'logHandle': log_handle,
             'indentationLevel': indentation_level,
-            'format': format}
+            'format': format,
+            'keyWriter': _KEY_WRITERS.get(format, _write_key_text)}
 
         if log_handle:
             self.write_log_header(write_dict)
@@ -318,22 +433,27 @@ class Process:
                 # 3.1
                 try:
                     log_handle = (
-                        open(log_filename, mode='wt', encoding='utf-8'))
+                        open(log_filename, mode='wt', encoding='utf-8',
+                             buffering=LOG_BUFFER_SIZE))
                 # 2.6
                 except:
-                    log_handle = open(log_filename, mode='wt')
+                    log_handle = open(log_filename, mode='wt',
+                                      buffering=LOG_BUFFER_SIZE)
             except:
                 print('Couldn\'t open log : %s' % log_filename)
                 log_handle = None
 
         if log_handle:
+            # The log is assembled in memory and written in one go.
+            log_buffer = StringIO()
             if header:
                 if format == 'xml':
-                    log_handle.write('<![CDATA[\n')
-                log_handle.write(header)
+                    log_buffer.write('<![CDATA[\n')
+                log_buffer.write(header)
                 if format == 'xml':
-                    log_handle.write(']]>\n')
-            self.write_log(log_handle, format=format)
+                    log_buffer.write(']]>\n')
+            self.write_log(log_buffer, format=format)
+            log_handle.write(log_buffer.getvalue())
             log_handle.close()
 
     def log_line(self, line):
@@ -351,9 +471,31 @@ class Process:
              Return value description.
         """
 
-        self.log.append(line.rstrip())
+        line = line.rstrip()
+        self.log.append(line)
         if self.echo:
-            print('%s' % line.rstrip())
+            self.echo_buffer.append('%s\n' % line)
+            if len(self.echo_buffer) >= ECHO_BUFFER_SIZE:
+                self.flush_echo()
+
+    def flush_echo(self):
+        """
+        Writes the buffered log lines to the standard output.
+        """
+
+        if self.echo_buffer:
+            sys.stdout.write(''.join(self.echo_buffer))
+            sys.stdout.flush()
+            self.echo_buffer = []
+
+    def _flag_report_dirty(self):
+        """
+        Flags the reports of the process lists holding the current process as
+        outdated.
+        """
+
+        for process_list in self._process_lists:
+            process_list._flag_report_dirty()
 
     def execute(self):
         """
@@ -370,137 +512,84 @@ class Process:
              Return value description.
         """
 
-        import datetime
-        import traceback
-
-        try:
-            import subprocess as sp
-        except:
-            sp = None
-
         self.start = datetime.datetime.now()
+        self.start_time = _timer()
 
         cmdargs = [self.cmd]
         cmdargs.extend(self.args)
 
         if self.echo:
-            if sp:
-                print(
-                    '\n%s : %s\n' % (self.__class__, sp.list2cmdline(cmdargs)))
-            else:
-                print('\n%s : %s\n' % (self.__class__, ' '.join(cmdargs)))
+            print('\n%s : %s\n' % (self.__class__,
+                                    subprocess.list2cmdline(cmdargs)))
 
         process = None
         tmp_wrapper = None
-        stdout = None
-        stdin = None
-        parentenv = os.environ
-        parentcwd = os.getcwd()
 
         try:
-            # Using *subprocess*.
-            if sp:
-                if self.batch_wrapper:
-                    cmd = ' '.join(cmdargs)
-                    tmp_wrapper = os.path.join(self.cwd, 'process.bat')
-                    write_text(cmd, tmp_wrapper)
-                    print('%s : Running process through wrapper %s\n' % (
-                        self.__class__, tmp_wrapper))
-                    process = sp.Popen([tmp_wrapper], stdout=sp.PIPE,
-                                       stderr=sp.STDOUT,
-                                       cwd=self.cwd, env=self.env)
-                else:
-                    process = sp.Popen(cmdargs, stdout=sp.PIPE,
-                                       stderr=sp.STDOUT,
-                                       cwd=self.cwd, env=self.env)
-
-            # using *os.popen4*.
+            if self.batch_wrapper:
+                cmd = ' '.join(cmdargs)
+                # A unique wrapper per process, so that concurrently executed
+                # processes do not overwrite each other's wrapper.
+                fd, tmp_wrapper = tempfile.mkstemp(suffix='.bat',
+                                                   prefix='process_',
+                                                   dir=self.cwd)
+                with os.fdopen(fd, 'w') as fp:
+                    fp.write(cmd)
+                print('%s : Running process through wrapper %s\n' % (
+                    self.__class__, tmp_wrapper))
+                process = subprocess.Popen([tmp_wrapper],
+                                           stdout=subprocess.PIPE,
+                                           stderr=subprocess.STDOUT,
+                                           cwd=self.cwd, env=self.env)
             else:
-                if self.env:
-                    os.environ = self.env
-                if self.cwd:
-                    os.chdir(self.cwd)
-
-                stdin, stdout = os.popen4(cmdargs, 'r')
+                process = subprocess.Popen(cmdargs,
+                                           stdout=subprocess.PIPE,
+                                           stderr=subprocess.STDOUT,
+                                           cwd=self.cwd, env=self.env)
         except:
             print('Couldn\'t execute command : %s' % cmdargs[0])
             traceback.print_exc()
 
-        # Using *subprocess*
-        if sp:
+        try:
             if process is not None:
                 # pid = process.pid
                 # log.logLine('process id %s\n' % pid)
 
                 try:
-                    # This is more proper python, and resolves some issues with
-                    # a process ending before all of its output has been
-                    # processed, but it also seems to stall when the read
-                    # buffer is near or over its limit. This happens
-                    # relatively frequently with processes that generate lots
-                    # of print statements.
-                    for line in process.stdout:
-                        self.log_line(line)
-
-                    # So we go with the, um, uglier option below.
-
-                    # This is now used to ensure that the process has finished.
-                    line = ''
-                    while line is not None and process.poll() is None:
-                        try:
-                            line = process.stdout.readline()
-                        except:
+                    # Draining the pipe in large chunks until the process
+                    # closes it, and splitting the output into lines here.
+                    fd = process.stdout.fileno()
+                    pending = b''
+                    while True:
+                        chunk = os.read(fd, 65536)
+                        if not chunk:
                             break
-                        # 3.1
-                        try:
-                            # TODO: Investigate previous eroneous statement.
-                            # self.log_line(str(line, encoding='utf-8'))
-                            self.log_line(str(line))
-                        # 2.6
-                        except:
-                            self.log_line(line)
+                        lines = (pending + chunk).split(b'\n')
+                        pending = lines.pop()
+                        for line in lines:
+                            self.log_line(_decode_output(line))
+                    if pending:
+                        self.log_line(_decode_output(pending))
                 except:
                     self.log_line('Logging error : %s' % sys.exc_info()[0])
 
+                process.stdout.close()
+                process.wait()
                 self.status = process.returncode
 
-                if self.batch_wrapper and tmp_wrapper:
-                    try:
-                        os.remove(tmp_wrapper)
-                    except:
-                        print(
-                            'Couldn\'t remove temp wrapper : %s' % tmp_wrapper)
-                        traceback.print_exc()
-
-        # Using *os.popen4*.
-        else:
-            exit_code = -1
-            try:
-                stdout_lines = stdout.readlines()
-                # TODO: Investigate if this is the good behavior, close() does
-                # not return anything / None.
-                exit_code = stdout.close()
-
-                stdout.close()
-                stdin.close()
-
-                if self.env:
-                    os.environ = parentenv
-                if self.cwd:
-                    os.chdir(parentcwd)
-
-                if len(stdout_lines) > 0:
-                    for line in stdout_lines:
-                        self.log_line(line)
-
-                if not exit_code:
-                    exit_code = 0
-            except:
-                self.log_line('Logging error : %s' % sys.exc_info()[0])
-
-            self.status = exit_code
+            if self.batch_wrapper and tmp_wrapper:
+                try:
+                    os.remove(tmp_wrapper)
+                except:
+                    print('Couldn\'t remove temp wrapper : %s' % tmp_wrapper)
+                    traceback.print_exc()
+        finally:
+            self.flush_echo()
 
         self.end = datetime.datetime.now()
+        self.end_time = _timer()
+
+        self._flag_report_dirty()
 
 
 class ProcessList(Process):
@@ -527,6 +616,31 @@ class ProcessList(Process):
         'Initialize the standard class variables'
         self.processes = []
         self.blocking = blocking
+        self._report_dirty = True
+        self._report_layout = None
+
+    def _flag_report_dirty(self):
+        """
+        Flags the report of the current process list, and of the process lists
+        holding it, as outdated.
+        """
+
+        self._report_dirty = True
+        Process._flag_report_dirty(self)
+
+    def add_child(self, child):
+        """
+        Adds given child process to the list.
+
+        Parameters
+        ----------
+        child : Process or ProcessList
+            Child process to add.
+        """
+
+        self.processes.append(child)
+        child._process_lists.append(self)
+        self._flag_report_dirty()
 
     def generate_report(self, write_dict):
         """
@@ -543,9 +657,15 @@ class ProcessList(Process):
              Return value description.
         """
 
+        # The report is only regenerated once the child processes or their
+        # execution changed, or when it is laid out differently.
+        report_layout = (write_dict['indentationLevel'], write_dict['format'])
+        if not self._report_dirty and report_layout == self._report_layout:
+            return
+
         if self.processes:
             _status = True
-            indent = '\t' * (write_dict['indentationLevel'] + 1)
+            indent = _indent(write_dict['indentationLevel'] + 1)
 
             self.log = []
 
@@ -573,6 +693,9 @@ class ProcessList(Process):
             self.log = ['No child processes available to generate a report']
             self.status = -1
 
+        self._report_dirty = False
+        self._report_layout = report_layout
+
     def write_log_header(self, write_dict):
         """
         Object description.
@@ -639,7 +762,8 @@ class ProcessList(Process):
         write_dict = {
             'logHandle': log_handle,
             'indentationLevel': indentation_level,
-            'format': format}
+            'format': format,
+            'keyWriter': _KEY_WRITERS.get(format, _write_key_text)}
 
         if log_handle:
             self.write_log_header(write_dict)
@@ -658,6 +782,26 @@ class ProcessList(Process):
 
             self.write_log_footer(write_dict)
 
+    def execute_child(self, child):
+        """
+        Executes given child process, setting its status to -1 if it raises an
+        exception.
+
+        Parameters
+        ----------
+        child : Process or ProcessList
+            Child process to execute.
+        """
+
+        try:
+            child.execute()
+        except:
+            print('%s : caught exception in child class %s' % (
+                self.__class__, child.__class__))
+            traceback.print_exc()
+            child.status = -1
+            child._flag_report_dirty()
+
     def execute(self):
         """
         Executes the list of processes.
@@ -673,29 +817,40 @@ class ProcessList(Process):
              Return value description.
         """
 
-        import datetime
+        self._flag_report_dirty()
 
         self.start = datetime.datetime.now()
+        self.start_time = _timer()
 
         self.status = 0
         if self.processes:
-            for child in self.processes:
-                if child:
+            if self.blocking:
+                for child in self.processes:
+                    if child:
+                        self.execute_child(child)
+
+                        if child.status != 0:
+                            print('%s : child class %s finished with an error'
+                                  % (self.__class__, child.__class__))
+                            self.status = -1
+                            break
+            else:
+                # Non blocking children are independent and spend their time
+                # waiting on external processes, they are run concurrently.
+                children = [child for child in self.processes if child]
+                if children:
+                    pool = ThreadPool(min(len(children),
+                                          multiprocessing.cpu_count()))
                     try:
-                        child.execute()
-                    except:
-                        print('%s : caught exception in child class %s' % (
-                            self.__class__, child.__class__))
-                        traceback.print_exc()
-                        child.status = -1
-
-                    if self.blocking and child.status != 0:
-                        print('%s : child class %s finished with an error' % (
-                            self.__class__, child.__class__))
-                        self.status = -1
-                        break
+                        pool.map(self.execute_child, children)
+                    finally:
+                        pool.close()
+                        pool.join()
 
         self.end = datetime.datetime.now()
+        self.end_time = _timer()
+
+        self._flag_report_dirty()
 
 
 def main():
@@ -742,7 +897,7 @@ def main():
 
     # Testing report generation and writing a log.
     process_list = ProcessList('a process list')
-    process_list.processes.append(process)
+    process_list.add_child(process)
     process_list.echo = True
     process_list.execute()
 
@@ -10,7 +10,6 @@ from __future__ import division
 import itertools
 import os
 import re
-from collections import OrderedDict
 
 import PyOpenColorIO as ocio
 
@@ -31,12 +30,36 @@ __all__ = ['ColorSpace',
            'colorspace_prefixed_name',
            'unpack_default']
 
+# Characters replaced with an underscore by :func:`sanitize`.
+_SANITIZE_PATTERN = re.compile(r'[ ()]')
+
+# Characters removed by :func:`compact`.
+_COMPACT_PATTERN = re.compile(r'[ ().\-_]+')
+
+# Cache of the 4x4 matrices created by :func:`mat44_from_mat33`, keyed by the
+# 3x3 matrix values.
+_MAT44_CACHE = {}
+
 
 class ColorSpace(object):
     """
     A container for data needed to define an *OCIO* *ColorSpace*.
     """
 
+    __slots__ = ('name',
+                 'base_name',
+                 'aliases',
+                 'bit_depth',
+                 'description',
+                 'equality_group',
+                 'family',
+                 'is_data',
+                 'to_reference_transforms',
+                 'from_reference_transforms',
+                 'allocation_type',
+                 'allocation_vars',
+                 'aces_transform_id')
+
     def __init__(self,
                  name,
                  aliases=None,
@@ -90,6 +113,9 @@ def mat44_from_mat33(mat33):
     """
     Creates a 4x4 matrix from given 3x3 matrix.
 
+    The 4x4 matrices are cached, repeated calls with the same 3x3 matrix values
+    return the same immutable 4x4 matrix.
+
     Parameters
     ----------
     mat33 : array of float
@@ -97,14 +123,44 @@ def mat44_from_mat33(mat33):
 
     Returns
     -------
-    array of float
+    tuple of float
          A 4x4 matrix
     """
 
-    return [mat33[0], mat33[1], mat33[2], 0,
-            mat33[3], mat33[4], mat33[5], 0,
-            mat33[6], mat33[7], mat33[8], 0,
-            0, 0, 0, 1]
+    key = tuple(mat33)
+    mat44 = _MAT44_CACHE.get(key)
+    if mat44 is None:
+        mat44 = (mat33[0], mat33[1], mat33[2], 0,
+                 mat33[3], mat33[4], mat33[5], 0,
+                 mat33[6], mat33[7], mat33[8], 0,
+                 0, 0, 0, 1)
+        _MAT44_CACHE[key] = mat44
+
+    return mat44
+
+
+def _compile_filters(filters, flags=0):
+    """
+    Compiles given filters into a single regular expression matching any of
+    them.
+
+    Parameters
+    ----------
+    filters : array of str or unicode
+        Filters to compile.
+    flags : int, optional
+        Flags for re.compile
+
+    Returns
+    -------
+    RegexObject
+        The compiled filters or *None* if there are no filters.
+    """
+
+    if not filters:
+        return None
+
+    return re.compile('|'.join('(?:%s)' % filter for filter in filters), flags)
 
 
 def filter_words(words, filters_in=None, filters_out=None, flags=0):
@@ -128,27 +184,12 @@ def filter_words(words, filters_in=None, filters_out=None, flags=0):
          An array of matched or unmatched strings
     """
 
-    filtered_words = []
-    for word in words:
-        if filters_in:
-            filter_matched = False
-            for filter in filters_in:
-                if re.search(filter, word, flags):
-                    filter_matched = True
-                    break
-            if not filter_matched:
-                continue
-
-        if filters_out:
-            filter_matched = False
-            for filter in filters_out:
-                if re.search(filter, word, flags):
-                    filter_matched = True
-                    break
-            if filter_matched:
-                continue
-        filtered_words.append(word)
-    return filtered_words
+    filter_in = _compile_filters(filters_in, flags)
+    filter_out = _compile_filters(filters_out, flags)
+
+    return [word for word in words
+            if (filter_in is None or filter_in.search(word)) and
+            (filter_out is None or not filter_out.search(word))]
 
 
 def files_walker(directory, filters_in=None, filters_out=None, flags=0):
@@ -173,12 +214,18 @@ def files_walker(directory, filters_in=None, filters_out=None, flags=0):
          The next matching file or directory name
     """
 
+    filter_in = _compile_filters(filters_in, flags)
+    filter_out = _compile_filters(filters_out, flags)
+
     for parent_directory, directories, files in os.walk(
             directory, topdown=False, followlinks=True):
         for file in files:
             path = os.path.join(parent_directory, file)
             if os.path.isfile(path):
-                if not filter_words((path,), filters_in, filters_out, flags):
+                if filter_in is not None and not filter_in.search(path):
+                    continue
+
+                if filter_out is not None and filter_out.search(path):
                     continue
 
                 yield path
@@ -211,7 +258,7 @@ def replace(string, data):
     u'Users are: Luke Skywalker, Anakin Skywalker, R2D2.'
     """
 
-    for old, new in data.iteritems():
+    for old, new in data.items():
         string = string.replace(old, new)
     return string
 
@@ -231,7 +278,7 @@ def sanitize(path):
         Manipulated string.
     """
 
-    return replace(path, {' ': '_', ')': '_', '(': '_'})
+    return _SANITIZE_PATTERN.sub('_', path)
 
 
 def compact(string):
@@ -249,15 +296,7 @@ def compact(string):
          A compact version of that string.
     """
 
-    return replace(string.lower(),
-                   OrderedDict(((' ', '_'),
-                                ('(', '_'),
-                                (')', '_'),
-                                ('.', '_'),
-                                ('-', '_'),
-                                ('___', '_'),
-                                ('__', '_'),
-                                ('_', ''))))
+    return _COMPACT_PATTERN.sub('', string.lower())
 
 
 def colorspace_prefixed_name(colorspace):